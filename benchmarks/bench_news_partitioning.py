@@ -0,0 +1,192 @@
+"""
+news 테이블 인덱스 / 파티셔닝 / 본문 아카이브가 각각 조회 시간에 주는 효과를 비교하는 벤치마크.
+
+MySQL에 네 개의 벤치마크 테이블을 만들고 같은 합성 데이터를 적재합니다. 각 테이블은 앞 테이블에서 한 가지만 바꿉니다.
+  - before     : 기존 news 스키마 (news_id PK, url UNIQUE, stock_id 인덱스, 모든 본문을 LONGTEXT로 보관)
+  - indexed    : before + (stock_id, news_upload_time) 복합 인덱스 (파티션 없음)
+  - partitioned: indexed + news_upload_time 월별 RANGE 파티션 (본문은 모두 보관)
+  - after      : partitioned + 보존 기간이 지난 행의 본문을 비운 상태 (news_archive_service 적용 후와 동일)
+
+사용 예:
+    python -m benchmarks.bench_news_partitioning --rows 2000000 --body-bytes 2000
+
+주의: 지정한 DB에 bench_news_* 테이블을 생성하고 삭제합니다.
+아직 수백만 행 규모로 실행한 결과가 없으므로, 실행 후 README의 결과 표를 채워야 합니다.
+"""
+import argparse
+import random
+import statistics
+import string
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+from config import settings
+from stock_analyzer.service.news_partition_service import monthly_boundaries, partition_definitions
+
+BEFORE_TABLE = "bench_news_before"
+INDEXED_TABLE = "bench_news_indexed"
+PARTITIONED_TABLE = "bench_news_partitioned"
+AFTER_TABLE = "bench_news_after"
+TABLES = [
+    ("before", BEFORE_TABLE),
+    ("indexed", INDEXED_TABLE),
+    ("partitioned", PARTITIONED_TABLE),
+    ("after", AFTER_TABLE),
+]
+
+
+def create_tables(conn, start: date, end: date):
+    for _, table in TABLES:
+        conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+
+    for table, extra_index in ((BEFORE_TABLE, ""),
+                               (INDEXED_TABLE, ",\n            INDEX ix_news_stock_upload_time (stock_id, news_upload_time)")):
+        conn.execute(text(f"""
+        CREATE TABLE {table} (
+            news_id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+            title VARCHAR(300) NOT NULL,
+            content LONGTEXT NOT NULL,
+            url VARCHAR(300) NOT NULL UNIQUE,
+            stock_id INT NOT NULL,
+            news_upload_time DATETIME NULL,
+            INDEX ix_stock_id (stock_id){extra_index}
+        )
+        """))
+
+    for table in (PARTITIONED_TABLE, AFTER_TABLE):
+        conn.execute(text(f"""
+        CREATE TABLE {table} (
+            news_id INT NOT NULL AUTO_INCREMENT,
+            title VARCHAR(300) NOT NULL,
+            content LONGTEXT NOT NULL,
+            url VARCHAR(300) NOT NULL,
+            stock_id INT NOT NULL,
+            news_upload_time DATETIME NOT NULL,
+            archived_at DATETIME NULL,
+            archive_ref VARCHAR(300) NULL,
+            PRIMARY KEY (news_id, news_upload_time),
+            INDEX ix_news_url (url),
+            INDEX ix_news_stock_upload_time (stock_id, news_upload_time)
+        )
+        PARTITION BY RANGE COLUMNS(news_upload_time) (
+            {partition_definitions(monthly_boundaries(start, end))}
+        )
+        """))
+
+
+def load_rows(conn, rows: int, symbols: int, body_bytes: int, days: int, retention_days: int, batch_size: int):
+    now = datetime.now()
+    cutoff = now - timedelta(days=retention_days)
+    # 매 행마다 난수 문자열을 만들지 않도록 큰 텍스트 풀에서 잘라 씁니다.
+    pool = "".join(random.choices(string.ascii_letters + " ", k=body_bytes * 4))
+
+    def insert_sql(table: str, archive_columns: bool):
+        columns = "title, content, url, stock_id, news_upload_time"
+        values = ":title, :content, :url, :stock_id, :news_upload_time"
+        if archive_columns:
+            columns += ", archived_at, archive_ref"
+            values += ", :archived_at, :archive_ref"
+        return text(f"INSERT INTO {table} ({columns}) VALUES ({values})")
+
+    for batch_start in range(0, rows, batch_size):
+        before_batch, after_batch = [], []
+        for i in range(batch_start, min(rows, batch_start + batch_size)):
+            upload_time = now - timedelta(seconds=random.randint(0, days * 86400))
+            offset = random.randint(0, len(pool) - body_bytes)
+            row = {
+                "title": f"news {i}",
+                "content": pool[offset:offset + body_bytes],
+                "url": f"/news/bench/{i}",
+                "stock_id": random.randint(1, symbols),
+                "news_upload_time": upload_time,
+            }
+            before_batch.append(row)
+            archived = upload_time < cutoff
+            after_batch.append({
+                **row,
+                "content": "" if archived else row["content"],
+                "archived_at": now if archived else None,
+                "archive_ref": f"bench/{i}" if archived else None,
+            })
+        conn.execute(insert_sql(BEFORE_TABLE, False), before_batch)
+        conn.execute(insert_sql(INDEXED_TABLE, False), before_batch)
+        conn.execute(insert_sql(PARTITIONED_TABLE, True),
+                     [{**row, "archived_at": None, "archive_ref": None} for row in before_batch])
+        conn.execute(insert_sql(AFTER_TABLE, True), after_batch)
+        conn.commit()
+        print(f"  적재 {min(rows, batch_start + batch_size):,}/{rows:,}행", end="\r", flush=True)
+    print()
+
+
+QUERIES = {
+    "심볼별 최신 뉴스 3건 (본문 포함)":
+        "SELECT title, content FROM {table} WHERE stock_id = :stock_id ORDER BY news_upload_time DESC LIMIT 3",
+    "심볼별 최근 30일 뉴스 수":
+        "SELECT COUNT(*) FROM {table} WHERE stock_id = :stock_id AND news_upload_time >= :since_30d",
+    "전체 최근 7일 뉴스 100건":
+        "SELECT news_id, title FROM {table} WHERE news_upload_time >= :since_7d ORDER BY news_upload_time DESC LIMIT 100",
+    "최근 30일 본문 총 길이":
+        "SELECT SUM(LENGTH(content)) FROM {table} WHERE news_upload_time >= :since_30d",
+}
+
+
+def time_query(conn, sql: str, params: dict, repeat: int) -> float:
+    """쿼리를 repeat번 실행한 시간의 중앙값(ms)을 반환합니다."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(text(sql), params).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def table_size_mb(conn, table: str) -> float:
+    size = conn.execute(text(
+        "SELECT SUM(DATA_LENGTH + INDEX_LENGTH) FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+    ), {"table": table}).scalar()
+    return (size or 0) / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.DATABASE_URL, help="MySQL 접속 URL")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--body-bytes", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=365 * 3, help="데이터를 분포시킬 기간(일)")
+    parser.add_argument("--retention-days", type=int, default=settings.NEWS_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="벤치마크 후 테이블을 삭제하지 않습니다.")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    today = date.today()
+    with engine.connect() as conn:
+        print(f"벤치마크 테이블 생성 및 {args.rows:,}행 적재 중...")
+        create_tables(conn, today - timedelta(days=args.days), today)
+        conn.commit()
+        load_rows(conn, args.rows, args.symbols, args.body_bytes, args.days, args.retention_days, args.batch_size)
+        for _, table in TABLES:
+            conn.execute(text(f"ANALYZE TABLE {table}")).fetchall()
+
+        now = datetime.now()
+        params = {"stock_id": 1, "since_30d": now - timedelta(days=30), "since_7d": now - timedelta(days=7)}
+
+        print(f"\n{'쿼리 (ms)':<32}" + "".join(f"{label:>14}" for label, _ in TABLES))
+        for name, sql in QUERIES.items():
+            timings = [time_query(conn, sql.format(table=table), params, args.repeat) for _, table in TABLES]
+            print(f"{name:<32}" + "".join(f"{timing:>14.2f}" for timing in timings))
+        print(f"{'테이블 크기 (MB)':<32}" + "".join(f"{table_size_mb(conn, table):>14.1f}" for _, table in TABLES))
+
+        if not args.keep:
+            for _, table in TABLES:
+                conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+            conn.commit()
+
+
+if __name__ == "__main__":
+    main()
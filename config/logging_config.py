@@ -1,47 +1,181 @@
+import atexit
+import contextvars
+import copy
+import json
+import logging
 import logging.config
+import logging.handlers
+import os
+import queue
+import random
+import re
+import uuid
+from typing import Optional
 from . import settings
 
+# 요청(또는 작업) 단위로 로그를 묶기 위한 상관관계 ID
+request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="-")
+# 외부에서 받은 ID가 로그 줄을 위조하거나 지나치게 길지 않도록 허용할 형식
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+_listener: Optional[logging.handlers.QueueListener] = None
+# fork로 생성된 워커 프로세스에는 리스너 스레드가 복사되지 않으므로 생성한 프로세스를 기록합니다.
+_listener_pid: Optional[int] = None
+
+
+def set_request_id(request_id: Optional[str] = None) -> str:
+    """
+    현재 컨텍스트(요청/작업)의 상관관계 ID를 설정하고 반환합니다.
+    값을 주지 않거나 허용된 형식(영문/숫자/'_'/'-', 최대 64자)이 아니면 새로 생성합니다.
+    """
+    if not request_id or not REQUEST_ID_PATTERN.fullmatch(request_id):
+        request_id = uuid.uuid4().hex[:16]
+    request_id_var.set(request_id)
+    return request_id
+
+
+class RequestContextFilter(logging.Filter):
+    """로그 레코드에 현재 컨텍스트의 request_id를 추가합니다."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class LargeMessageFilter(logging.Filter):
+    """
+    DEBUG 레벨의 큰 메시지(기사 원문 등)를 샘플링하고 설정된 길이로 자릅니다.
+    INFO 이상의 메시지는 그대로 둡니다.
+    """
+
+    def __init__(self, max_chars: int, sample_rate: float):
+        super().__init__()
+        self.max_chars = max_chars
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        message = record.getMessage()
+        if len(message) <= self.max_chars:
+            return True
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False
+        record.msg = f"{message[:self.max_chars]}... (총 {len(message)}자 중 {self.max_chars}자만 기록)"
+        record.args = None
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 레코드를 한 줄짜리 JSON으로 변환합니다."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class TracebackQueueHandler(logging.handlers.QueueHandler):
+    """
+    기본 QueueHandler.prepare는 traceback을 메시지 문자열에 합친 뒤 exc_info를 지우므로,
+    JSON 형식에서 traceback이 "message" 안에 섞입니다.
+    메시지만 미리 완성하고 traceback은 exc_text로 따로 넘겨 출력 포매터가 형식에 맞게 기록하도록 합니다.
+    """
+
+    _exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # 인자 객체가 다른 스레드에서 바뀌기 전에 로그를 남긴 스레드에서 메시지를 완성합니다.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
 def setup_logging():
     """
     프로젝트 전체에 적용될 로깅 설정을 구성하고 적용
     main.py에서 애플리케이션 시작 시 한 번만 호출
+
+    요청을 처리하는 스레드는 로그 레코드를 큐에 넣기만 하고(QueueHandler),
+    실제 콘솔/파일 출력은 별도 스레드(QueueListener)가 담당합니다.
     """
+    global _listener, _listener_pid
+    if _listener is not None and _listener_pid == os.getpid():
+        return
+
     LOGGING_CONFIG = {
         'version': 1,
         'disable_existing_loggers': False,
         # 로그 출력 형식 정의
         "formatters": {
             "detailed": {
-                "format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+                "format": "%(asctime)s [%(levelname)s] [%(request_id)s] %(name)s: %(message)s",
                 "datefmt": "%Y-%m-%d %H:%M:%S",
             },
             "simple": {
                 "format": "[%(levelname)s] %(message)s",
             },
+            "json": {
+                "()": JsonFormatter,
+            },
         },
         #로그를 처리하는 방법 정의 (콘솔, 파일 등)
         "handlers": {
             "console": {
                 "class": "logging.StreamHandler",
                 "level": "INFO",
-                "formatter": "simple",
+                "formatter": "json" if settings.LOG_JSON else "simple",
                 "stream": "ext://sys.stdout",
             },
             "file": {
                 "class": "logging.handlers.RotatingFileHandler",
-                "level": "DEBUG",
-                "formatter": "detailed",
+                "level": settings.LOG_LEVEL,
+                "formatter": "json" if settings.LOG_JSON else "detailed",
                 "filename": settings.LOG_FILE_PATH,
                 "maxBytes": 1024 * 1024 * 10,  # 10MB
                 "backupCount": 5,
                 "encoding": "utf-8",
             },
         },
-        # 어떤 로거를 사용할지 정의 (root 로거는 모든 로거의 기본 설정)
+        # 출력 핸들러는 큐 리스너가 사용하므로 여기서는 별도 로거에만 연결해 둡니다.
+        "loggers": {
+            "config.logging_sink": {
+                "handlers": ["console", "file"],
+                "propagate": False,
+            },
+        },
         "root": {
-            "level": "DEBUG",
-            "handlers": ["console", "file"],
-        
+            "level": settings.LOG_LEVEL,
         }
     }
-    logging.config.dictConfig(LOGGING_CONFIG)
\ No newline at end of file
+    logging.config.dictConfig(LOGGING_CONFIG)
+
+    sink = logging.getLogger("config.logging_sink")
+    output_handlers = list(sink.handlers)
+    for handler in output_handlers:
+        sink.removeHandler(handler)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = TracebackQueueHandler(log_queue)
+    # 필터는 로그를 남기는 스레드에서 실행되므로 해당 요청의 request_id를 기록할 수 있습니다.
+    queue_handler.addFilter(RequestContextFilter())
+    queue_handler.addFilter(LargeMessageFilter(settings.LOG_MAX_MESSAGE_CHARS, settings.LOG_DEBUG_SAMPLE_RATE))
+    logging.getLogger().addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *output_handlers, respect_handler_level=True)
+    _listener_pid = os.getpid()
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -20,11 +20,110 @@ DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
 DATABASE_URL = f"{DB_TYPE}+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# Text-to-SQL 계획 캐시 설정
+SQL_PLAN_CACHE_ENABLED = os.getenv("SQL_PLAN_CACHE_ENABLED", "true").lower() == "true"
+SQL_PLAN_CACHE_MAX_SIZE = int(os.getenv("SQL_PLAN_CACHE_MAX_SIZE", "256"))
+SQL_PLAN_CACHE_TTL_SECONDS = float(os.getenv("SQL_PLAN_CACHE_TTL_SECONDS", "86400"))
+SQL_PLAN_CACHE_SCHEMA_CHECK_SECONDS = float(os.getenv("SQL_PLAN_CACHE_SCHEMA_CHECK_SECONDS", "60"))
+
+# 주가 이력 저장소 설정
+PRICE_DATA_DIR = Path(os.getenv("PRICE_DATA_DIR", Path(__file__).resolve().parent.parent / 'data' / 'prices'))
+PRICE_HISTORY_INITIAL_PERIOD = os.getenv("PRICE_HISTORY_INITIAL_PERIOD", "2y")
+PRICE_SYNC_INTERVAL_SECONDS = float(os.getenv("PRICE_SYNC_INTERVAL_SECONDS", "3600"))
+
+# 뉴스 배치 분류(AnalysisResults) 설정
+ANALYSIS_BATCH_SIZE = int(os.getenv("ANALYSIS_BATCH_SIZE", "10"))
+ANALYSIS_MAX_CONCURRENCY = int(os.getenv("ANALYSIS_MAX_CONCURRENCY", "4"))
+ANALYSIS_REQUESTS_PER_SECOND = float(os.getenv("ANALYSIS_REQUESTS_PER_SECOND", "2"))
+ANALYSIS_MAX_ARTICLE_CHARS = int(os.getenv("ANALYSIS_MAX_ARTICLE_CHARS", "4000"))
+ANALYSIS_MAX_ARTICLES_PER_RUN = int(os.getenv("ANALYSIS_MAX_ARTICLES_PER_RUN", "50"))
+ANALYSIS_SENTIMENT_DAYS = int(os.getenv("ANALYSIS_SENTIMENT_DAYS", "30"))
+
+# 비동기 분석 작업(Job) 설정
+JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND", "sqlite")
+JOB_QUEUE_PATH = Path(os.getenv("JOB_QUEUE_PATH", Path(__file__).resolve().parent.parent / 'data' / 'jobs.sqlite3'))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1"))
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "1800"))
+JOB_CALLBACK_TIMEOUT_SECONDS = float(os.getenv("JOB_CALLBACK_TIMEOUT_SECONDS", "10"))
+# 웹훅을 보낼 수 있는 호스트 목록(쉼표 구분). ".example.com"처럼 점으로 시작하면 하위 도메인까지 허용합니다.
+# 비어 있으면 웹훅을 받지 않습니다. (내부 주소로의 요청 위조 방지)
+JOB_CALLBACK_ALLOWED_HOSTS = [host.strip().lower() for host in os.getenv("JOB_CALLBACK_ALLOWED_HOSTS", "").split(",") if host.strip()]
+JOB_LONG_POLL_MAX_SECONDS = float(os.getenv("JOB_LONG_POLL_MAX_SECONDS", "30"))
+
+# 요청 마감 시간 및 노드별 시간 예산(초)
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "180"))
+# 최종 보고서 생성 전 노드들이 남겨둘 시간
+DEADLINE_RESERVE_SECONDS = float(os.getenv("DEADLINE_RESERVE_SECONDS", "45"))
+NODE_TIME_BUDGETS = {
+    "crawl_and_update_db": float(os.getenv("NODE_BUDGET_CRAWL_AND_UPDATE_DB", "30")),
+    "score_news_sentiment": float(os.getenv("NODE_BUDGET_SCORE_NEWS_SENTIMENT", "30")),
+    "fetch_financials": float(os.getenv("NODE_BUDGET_FETCH_FINANCIALS", "15")),
+    "fetch_price_history": float(os.getenv("NODE_BUDGET_FETCH_PRICE_HISTORY", "15")),
+    "fetch_db_news": float(os.getenv("NODE_BUDGET_FETCH_DB_NEWS", "45")),
+    "generate_answer": float(os.getenv("NODE_BUDGET_GENERATE_ANSWER", "60")),
+}
+NODE_EXECUTOR_WORKERS = int(os.getenv("NODE_EXECUTOR_WORKERS", "32"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+# 뉴스 조회 단계가 시간 초과되었을 때 기사별로 사용할 최대 글자 수
+FALLBACK_NEWS_MAX_CHARS = int(os.getenv("FALLBACK_NEWS_MAX_CHARS", "1500"))
+# 대체 처리에서 DB에 접속/조회할 때 기다릴 최대 시간 (DB가 멈춘 경우에도 응답 시간이 이 값만큼만 늘어납니다)
+FALLBACK_DB_TIMEOUT_SECONDS = float(os.getenv("FALLBACK_DB_TIMEOUT_SECONDS", "3"))
+# 마지막으로 성공한 재무제표 조회 결과를 보관하는 디렉터리 (API 서버와 워커 프로세스가 공유)
+FINANCIAL_CACHE_DIR = Path(os.getenv("FINANCIAL_CACHE_DIR", Path(__file__).resolve().parent.parent / 'data' / 'financials'))
+
+# 긴 기사 요약(map-reduce) 설정
+# 기사를 SUMMARY_CHUNK_SIZE 글자 단위로 나누어 동시에 요약한 뒤, 요약들을 다시 묶어 하나로 줄입니다.
+SUMMARY_CHUNK_SIZE = int(os.getenv("SUMMARY_CHUNK_SIZE", "4000"))
+SUMMARY_CHUNK_OVERLAP = int(os.getenv("SUMMARY_CHUNK_OVERLAP", "200"))
+SUMMARY_MAX_CONCURRENCY = int(os.getenv("SUMMARY_MAX_CONCURRENCY", "4"))
+# 가장 최신 뉴스도 이 길이를 넘으면 원문 대신 요약을 보고서 프롬프트에 넣습니다.
+SUMMARY_RAW_MAX_CHARS = int(os.getenv("SUMMARY_RAW_MAX_CHARS", "6000"))
+SUMMARY_CACHE_PATH = Path(os.getenv("SUMMARY_CACHE_PATH", Path(__file__).resolve().parent.parent / 'data' / 'summary_cache.sqlite3'))
+# 이 시간보다 오래된 요약은 캐시에서 삭제합니다. (시작 시와 이후 한 시간마다)
+SUMMARY_CACHE_RETENTION_SECONDS = float(os.getenv("SUMMARY_CACHE_RETENTION_SECONDS", str(30 * 86400)))
+
+# 뉴스 보존 및 파티션 설정
+NEWS_RETENTION_DAYS = int(os.getenv("NEWS_RETENTION_DAYS", "180"))
+NEWS_ARCHIVE_DIR = Path(os.getenv("NEWS_ARCHIVE_DIR", Path(__file__).resolve().parent.parent / 'data' / 'news_archive'))
+NEWS_ARCHIVE_BATCH_SIZE = int(os.getenv("NEWS_ARCHIVE_BATCH_SIZE", "500"))
+NEWS_PARTITION_MONTHS_AHEAD = int(os.getenv("NEWS_PARTITION_MONTHS_AHEAD", "3"))
+
+# 뉴스 중복(재배포) 탐지 설정
+# link: 중복 기사는 본문 없이 원본 기사(duplicate_of)에 연결해 저장, skip: 저장하지 않음, off: 탐지하지 않음
+NEWS_DEDUP_MODE = os.getenv("NEWS_DEDUP_MODE", "link").lower()
+# SimHash 지문의 해밍 거리가 이 값 이하이면 같은 기사로 판단합니다. (밴드 인덱스 구조상 최대 3)
+NEWS_DEDUP_MAX_DISTANCE = min(int(os.getenv("NEWS_DEDUP_MAX_DISTANCE", "3")), 3)
+# 단어 수가 이보다 적은 본문은 지문이 불안정하므로 중복 탐지를 하지 않습니다.
+NEWS_DEDUP_MIN_TOKENS = int(os.getenv("NEWS_DEDUP_MIN_TOKENS", "30"))
+
+# 그래프 실행 체크포인트 설정
+CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "true").lower() == "true"
+CHECKPOINT_DB_PATH = Path(os.getenv("CHECKPOINT_DB_PATH", Path(__file__).resolve().parent.parent / 'data' / 'checkpoints.sqlite3'))
+# 같은 run_id로 재시도할 때 이전에 완료된 노드 결과를 재사용할 수 있는 시간
+CHECKPOINT_FRESHNESS_SECONDS = float(os.getenv("CHECKPOINT_FRESHNESS_SECONDS", "3600"))
+# 이 시간보다 오래된 실행의 체크포인트는 시작 시 삭제합니다.
+CHECKPOINT_RETENTION_SECONDS = float(os.getenv("CHECKPOINT_RETENTION_SECONDS", "86400"))
+# 같은 run_id의 실행이 동시에 진행되지 않도록 잡는 임대(lease)의 유효 시간. 실행이 비정상 종료되어도 이 시간이 지나면 풀립니다.
+CHECKPOINT_LEASE_SECONDS = float(os.getenv("CHECKPOINT_LEASE_SECONDS", str(REQUEST_DEADLINE_SECONDS * 2)))
+
 # 디버그 유무 MODE의 값이 debug일 시 True 반환
 MODE = os.getenv("MODE")
 DEBUG = MODE == "debug"
 
 
+# 로그 설정
+# 기본 레벨은 디버그 모드에서만 DEBUG이며, LOG_JSON=true이면 JSON 한 줄 형식으로 출력합니다.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG" if DEBUG else "INFO").upper()
+LOG_JSON = os.getenv("LOG_JSON", "false").lower() == "true"
+# DEBUG 메시지가 이 길이를 넘으면 잘라서 기록하고, LOG_DEBUG_SAMPLE_RATE 비율만 남깁니다.
+LOG_MAX_MESSAGE_CHARS = int(os.getenv("LOG_MAX_MESSAGE_CHARS", "2000"))
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+# SQLAlchemy가 실행하는 모든 SQL을 로그로 남길지 여부
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+
 # 로그 파일 경로
 LOGS_DIR = Path(__file__).resolve().parent.parent / 'logs'
 LOG_FILE_PATH = LOGS_DIR / 'app.log'
@@ -1,8 +1,18 @@
+import asyncio
 import logging
-from fastapi import FastAPI, HTTPException
+import time
+import uuid
+from typing import Optional
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from stock_analyzer.graph.builder import get_graph_app
-from config.logging_config import setup_logging
+from stock_analyzer.graph.checkpoint import RunInProgressError
+from stock_analyzer.graph.runner import run_analysis_graph
+from stock_analyzer.jobs.queue import get_job_queue
+from stock_analyzer.jobs.callbacks import validate_callback_url
+from config import settings
+from config.logging_config import setup_logging, set_request_id
 
 # 1. 로깅 및 FastAPI 앱, 그래프 앱 초기화
 try:
@@ -14,15 +24,33 @@ try:
         version="1.0.0"
     )
     graph_app = get_graph_app()
+    job_queue = get_job_queue()
 except Exception as e:
     # 초기화 단계에서 오류 발생 시 로그를 남기고 프로그램을 종료할 수 있도록 처리
     logging.critical(f"애플리케이션 초기화 실패: {e}", exc_info=True)
     raise
 
+@app.middleware("http")
+async def add_request_id(request: Request, call_next):
+    """
+    요청마다 상관관계 ID를 설정하여 해당 요청에서 남긴 모든 로그에 포함시킵니다.
+    클라이언트가 X-Request-ID 헤더를 보내면 그 값을 사용하고, 응답 헤더로 돌려줍니다.
+    헤더 값이 허용된 형식이 아니면(줄바꿈 포함, 64자 초과 등) 새로 생성한 ID를 사용합니다.
+    """
+    request_id = set_request_id(request.headers.get("X-Request-ID"))
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 # 2. 입력 데이터 모델 정의 (Pydantic 사용)
 # API 요청의 본문(body) 형식을 강제하여 데이터 유효성을 검사합니다.
 class AnalysisRequest(BaseModel):
     symbol: str
+    run_id: Optional[str] = None
+
+class JobRequest(BaseModel):
+    symbol: str
+    callback_url: Optional[str] = None
 
 # 3. API 엔드포인트 생성
 @app.post("/analyze", summary="주식 분석 실행", description="주어진 심볼에 대해 분석 워크플로우를 실행하고 최종 보고서를 반환합니다.")
@@ -31,39 +59,84 @@ def analyze_stock(request: AnalysisRequest):
     주어진 심볼에 대해 분석을 수행하고 결과를 반환하는 API 엔드포인트입니다.
     
     - **symbol**: 분석할 주식의 심볼 (예: "AAPL")
+    - **run_id**: (선택) 실패한 분석을 재시도할 때 이전 응답의 run_id를 보내면 완료된 단계는 다시 실행하지 않습니다.
     """
+    symbol = request.symbol.upper()
+    run_id = request.run_id or uuid.uuid4().hex
     try:
-        symbol = request.symbol.upper()
         logger.info(f"API 분석 요청 수신: {symbol}")
 
-        # LangGraph 실행을 위한 초기 상태 정의
-        initial_state = {
-            "question": symbol,
-            "crawled_urls": [],
-            "db_result": "",
-            "web_result": "",
-            "balance_sheet": "",
-            "income_statement": "",
-            "cash_flow": "",
-            "final_answer": ""
-        }
-
         # 그래프 워크플로우 실행
-        final_answer = "분석 결과를 생성하지 못했습니다."
-        for event in graph_app.stream(initial_state):
-            # 'generate_answer' 노드가 실행된 이벤트에서 최종 결과를 찾습니다.
-            if "generate_answer" in event:
-                final_answer = event["generate_answer"].get('final_answer', final_answer)
+        final_answer = run_analysis_graph(graph_app, symbol, run_id)
 
         logger.info(f"'{symbol}'에 대한 분석 완료.")
-        return {"symbol": symbol, "analysis_report": final_answer}
+        return {"symbol": symbol, "run_id": run_id, "analysis_report": final_answer}
 
+    except RunInProgressError as e:
+        logger.warning(str(e))
+        # 진행 중인 실행과 동시에 같은 run_id로 실행하지 않습니다. 잠시 후 같은 run_id로 다시 요청하면 결과를 재사용합니다.
+        raise HTTPException(status_code=409, detail="같은 run_id의 분석이 아직 진행 중입니다. 잠시 후 다시 요청해주세요.",
+                            headers={"X-Run-ID": run_id})
     except Exception as e:
         logger.error(f"'/analyze' 엔드포인트 처리 중 오류 발생: {e}", exc_info=True)
         # 클라이언트에게 서버 내부 오류를 알립니다.
-        raise HTTPException(status_code=500, detail="분석 중 서버 내부 오류가 발생했습니다.")
+        # 같은 run_id로 다시 요청하면 실패한 단계부터 이어서 실행할 수 있도록 헤더로 알려줍니다.
+        raise HTTPException(status_code=500, detail="분석 중 서버 내부 오류가 발생했습니다.",
+                            headers={"X-Run-ID": run_id})
 
 
 @app.get("/", summary="API 상태 확인", description="API 서버가 정상적으로 실행 중인지 확인합니다.")
 def read_root():
-    return {"status": "AI Stock Analyzer API is running."}
\ No newline at end of file
+    return {"status": "AI Stock Analyzer API is running."}
+
+
+@app.post("/jobs", status_code=202, summary="분석 작업 등록", description="분석 작업을 큐에 등록하고 작업 ID를 즉시 반환합니다. 작업은 별도의 워커 프로세스가 실행합니다.")
+def submit_job(request: JobRequest):
+    """
+    분석 작업을 큐에 등록합니다.
+
+    - **symbol**: 분석할 주식의 심볼 (예: "AAPL")
+    - **callback_url**: (선택) 작업 종료 시 결과를 POST로 받을 웹훅 URL. http/https이고 허용된 호스트(JOB_CALLBACK_ALLOWED_HOSTS)여야 합니다.
+    """
+    if request.callback_url:
+        try:
+            validate_callback_url(request.callback_url)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    try:
+        job = job_queue.enqueue(request.symbol.upper(), request.callback_url)
+        logger.info(f"분석 작업 등록: {job.job_id} ({job.symbol})")
+        return {"job_id": job.job_id, "status": job.status.value}
+    except Exception as e:
+        logger.error(f"'/jobs' 작업 등록 중 오류 발생: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="분석 작업을 등록하지 못했습니다.")
+
+
+@app.get("/jobs/{job_id}", summary="분석 작업 조회", description="작업 상태와 완료된 경우 최종 보고서를 반환합니다. wait를 지정하면 작업이 끝날 때까지 최대 wait초 동안 대기합니다(long-poll).")
+async def get_job(job_id: str, wait: float = Query(0, ge=0, description="작업 종료를 기다릴 최대 시간(초)")):
+    """
+    작업 상태를 조회합니다.
+
+    - **job_id**: `POST /jobs`가 반환한 작업 ID
+    - **wait**: 작업이 끝날 때까지 기다릴 최대 시간(초). 서버 설정값을 넘을 수 없습니다.
+    """
+    deadline = time.monotonic() + min(wait, settings.JOB_LONG_POLL_MAX_SECONDS)
+    while True:
+        job = await run_in_threadpool(job_queue.get, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+        if job.is_finished or time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+
+    return {
+        "job_id": job.job_id,
+        "symbol": job.symbol,
+        "status": job.status.value,
+        "attempts": job.attempts,
+        "analysis_report": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
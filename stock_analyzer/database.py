@@ -1,5 +1,6 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateColumn
 from config import settings
 from .models import Base
 import logging
@@ -8,11 +9,28 @@ logger = logging.getLogger(__name__)
 
 
 # 데이터베이스 엔진 생성
-engine = create_engine(settings.DATABASE_URL, echo=True)
+engine = create_engine(settings.DATABASE_URL, echo=settings.DB_ECHO)
 
 # 데이터베이스 세션 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 시간 예산을 넘긴 노드의 대체 처리(fallback)에서 사용하는 엔진과 세션
+# 대체 처리는 요청 스레드에서 실행되므로 DB가 멈춘 경우에도 오래 기다리지 않도록
+# 커넥션 풀 대기, 접속, 소켓 읽기/쓰기 시간을 FALLBACK_DB_TIMEOUT_SECONDS로 제한합니다.
+fallback_engine = create_engine(
+    settings.DATABASE_URL,
+    echo=settings.DB_ECHO,
+    pool_size=2,
+    max_overflow=2,
+    pool_timeout=settings.FALLBACK_DB_TIMEOUT_SECONDS,
+    connect_args={
+        "connect_timeout": settings.FALLBACK_DB_TIMEOUT_SECONDS,
+        "read_timeout": settings.FALLBACK_DB_TIMEOUT_SECONDS,
+        "write_timeout": settings.FALLBACK_DB_TIMEOUT_SECONDS,
+    },
+)
+FallbackSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=fallback_engine)
+
 def init_db():
     """
     데이터베이스를 초기화하고 모든 테이블을 생성합니다.
@@ -20,8 +38,31 @@ def init_db():
     """
     logger.info("Initializing database...")
     Base.metadata.create_all(bind=engine)
+    migrate_schema()
     logger.info("Database initialization completed.")
 
+def migrate_schema():
+    """
+    create_all은 이미 존재하는 테이블을 변경하지 않으므로,
+    모델에 새로 추가된 컬럼과 인덱스를 기존 테이블에 추가합니다.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                logger.info(f"'{table.name}' 테이블에 '{column.name}' 컬럼을 추가합니다.")
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}"))
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
 def get_db():
     """
     데이터베이스 세션 객체를 제공하는 Dependency
@@ -1,18 +1,28 @@
 import logging
 from langgraph.graph import StateGraph, END
 from .state import GraphState
-from .nodes import (
-    fetch_db_news_node,
-    fetch_financials_node,
-    generate_final_answer_node,
-    crawl_and_update_db_node
-)
+from . import nodes
+from .deadline import with_time_budget
+from .checkpoint import get_checkpointer
+from config import settings
 
 logger = logging.getLogger(__name__)
 
-def get_graph_app():
+# (노드 이름, 노드 함수, 시간 초과 시 대체 함수)
+NODES = [
+    ("crawl_and_update_db", nodes.crawl_and_update_db_node, nodes.crawl_and_update_db_fallback),
+    ("score_news_sentiment", nodes.score_news_sentiment_node, nodes.score_news_sentiment_fallback),
+    ("fetch_financials", nodes.fetch_financials_node, nodes.fetch_financials_fallback),
+    ("fetch_price_history", nodes.fetch_price_history_node, nodes.fetch_price_history_fallback),
+    ("fetch_db_news", nodes.fetch_db_news_node, nodes.fetch_db_news_fallback),
+    ("generate_answer", nodes.generate_final_answer_node, nodes.generate_final_answer_fallback),
+]
+
+def get_graph_app(checkpointer=None):
     """
     LangGraph 워크플로우를 구성하고 컴파일하여 실행 가능한 app을 반환합니다.
+    checkpointer를 지정하지 않으면 설정에 따라 SQLite 체크포인터를 사용하여,
+    실패한 실행을 같은 run_id(thread_id)로 재시도할 때 마지막으로 완료된 노드부터 이어서 실행합니다.
     """
     logger.info("LangGraph 워크플로우를 구성합니다...")
     
@@ -20,10 +30,10 @@ def get_graph_app():
 
     # 1. 노드(작업 단위) 등록
     logger.debug("그래프 노드를 등록합니다.")
-    workflow.add_node("crawl_and_update_db", crawl_and_update_db_node)
-    workflow.add_node("fetch_financials", fetch_financials_node)
-    workflow.add_node("fetch_db_news", fetch_db_news_node)
-    workflow.add_node("generate_answer", generate_final_answer_node)
+    # 각 노드는 요청 마감 시각과 노드별 시간 예산 안에서 실행되며, 초과 시 대체 데이터를 사용합니다.
+    for name, node, fallback in NODES:
+        reserve = 0.0 if name == "generate_answer" else settings.DEADLINE_RESERVE_SECONDS
+        workflow.add_node(name, with_time_budget(name, node, fallback, settings.NODE_TIME_BUDGETS[name], reserve))
 
     # 2. 엣지(흐름) 연결
     logger.debug("그래프 엣지를 연결합니다.")
@@ -32,13 +42,17 @@ def get_graph_app():
     workflow.set_entry_point("crawl_and_update_db")
     
     # 일반 엣지 연결
-    workflow.add_edge("crawl_and_update_db", "fetch_financials")
-    workflow.add_edge("fetch_financials", "fetch_db_news")
+    workflow.add_edge("crawl_and_update_db", "score_news_sentiment")
+    workflow.add_edge("score_news_sentiment", "fetch_financials")
+    workflow.add_edge("fetch_financials", "fetch_price_history")
+    workflow.add_edge("fetch_price_history", "fetch_db_news")
     workflow.add_edge("fetch_db_news", "generate_answer")
     workflow.add_edge("generate_answer", END) # 최종 답변 생성 후 워크플로우 종료
 
     # 3. 그래프 컴파일
-    app = workflow.compile()
+    if checkpointer is None:
+        checkpointer = get_checkpointer()
+    app = workflow.compile(checkpointer=checkpointer)
     logger.info("LangGraph 컴파일이 완료되었습니다.")
     
     return app
\ No newline at end of file
@@ -0,0 +1,148 @@
+import logging
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def checkpoint_age_seconds(created_at: Optional[str]) -> float:
+    """체크포인트 생성 시각(ISO 8601 문자열)으로부터 지난 시간(초)을 반환합니다."""
+    if not created_at:
+        return float("inf")
+    created = datetime.fromisoformat(created_at)
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - created).total_seconds()
+
+
+def prune_checkpoints(saver: SqliteSaver, max_age_seconds: float) -> int:
+    """마지막 체크포인트가 max_age_seconds보다 오래된 실행(thread)의 체크포인트를 모두 삭제합니다."""
+    with saver.cursor(transaction=False) as cur:
+        cur.execute("SELECT DISTINCT thread_id FROM checkpoints")
+        thread_ids = [row[0] for row in cur.fetchall()]
+
+    pruned = 0
+    for thread_id in thread_ids:
+        latest = saver.get_tuple({"configurable": {"thread_id": thread_id}})
+        if latest is None or checkpoint_age_seconds(latest.checkpoint.get("ts")) > max_age_seconds:
+            saver.delete_thread(thread_id)
+            pruned += 1
+    if pruned:
+        logger.info(f"오래된 그래프 실행 체크포인트 {pruned}건을 삭제했습니다.")
+    return pruned
+
+
+def get_checkpointer() -> Optional[SqliteSaver]:
+    """
+    그래프 실행 상태를 노드 단위로 저장하는 SQLite 체크포인터를 생성합니다.
+    CHECKPOINT_ENABLED가 false이면 None을 반환합니다.
+    """
+    if not settings.CHECKPOINT_ENABLED:
+        return None
+
+    settings.CHECKPOINT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    # 서버의 요청 스레드와 노드 실행 스레드에서 함께 사용하므로 스레드 검사를 끄고, 잠금은 SqliteSaver가 담당합니다.
+    conn = sqlite3.connect(str(settings.CHECKPOINT_DB_PATH), check_same_thread=False, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    saver = SqliteSaver(conn)
+    saver.setup()
+
+    try:
+        prune_checkpoints(saver, settings.CHECKPOINT_RETENTION_SECONDS)
+    except Exception as e:
+        logger.warning(f"오래된 체크포인트 정리 중 오류 발생: {e}")
+    return saver
+
+
+class RunInProgressError(RuntimeError):
+    """같은 run_id의 그래프 실행이 이미 진행 중일 때 발생합니다."""
+
+
+class RunLeaseStore:
+    """
+    run_id별 실행 임대(lease)를 체크포인트 DB 파일에 기록합니다.
+    API 서버와 워커 프로세스가 같은 파일을 공유하므로, 클라이언트가 진행 중인 실행을 같은 run_id로
+    재시도해도 두 실행이 한 체크포인트 스레드에 동시에 기록하지 않습니다.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS run_leases (
+                    run_id TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        # isolation_level=None: 트랜잭션을 BEGIN IMMEDIATE로 직접 제어합니다.
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def acquire(self, run_id: str, owner: str, ttl_seconds: float) -> bool:
+        """임대가 없거나 만료되었으면 owner의 임대로 기록하고 True를 반환합니다."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT expires_at FROM run_leases WHERE run_id = ?", (run_id,)).fetchone()
+                if row is not None and row[0] > now:
+                    conn.execute("COMMIT")
+                    return False
+                conn.execute(
+                    "INSERT OR REPLACE INTO run_leases (run_id, owner, expires_at) VALUES (?, ?, ?)",
+                    (run_id, owner, now + ttl_seconds)
+                )
+                # 만료된 다른 임대도 함께 정리합니다.
+                conn.execute("DELETE FROM run_leases WHERE expires_at <= ?", (now,))
+                conn.execute("COMMIT")
+                return True
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def release(self, run_id: str, owner: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM run_leases WHERE run_id = ? AND owner = ?", (run_id, owner))
+
+    @contextmanager
+    def hold(self, run_id: str, ttl_seconds: Optional[float] = None):
+        """
+        실행이 끝날 때까지 run_id의 임대를 잡습니다.
+        다른 실행이 임대를 잡고 있으면 RunInProgressError를 발생시킵니다.
+        """
+        owner = uuid.uuid4().hex
+        ttl_seconds = settings.CHECKPOINT_LEASE_SECONDS if ttl_seconds is None else ttl_seconds
+        if not self.acquire(run_id, owner, ttl_seconds):
+            raise RunInProgressError(f"실행 '{run_id}'이 이미 진행 중입니다.")
+        try:
+            yield
+        finally:
+            self.release(run_id, owner)
+
+
+_lease_store: Optional[RunLeaseStore] = None
+
+
+def get_lease_store() -> RunLeaseStore:
+    """체크포인트 DB 파일을 사용하는 실행 임대 저장소를 반환합니다."""
+    global _lease_store
+    if _lease_store is None:
+        _lease_store = RunLeaseStore(settings.CHECKPOINT_DB_PATH)
+    return _lease_store
@@ -0,0 +1,93 @@
+import contextvars
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable
+
+from config import settings
+from .state import GraphState
+
+logger = logging.getLogger(__name__)
+
+# 노드를 시간 제한과 함께 실행하기 위한 스레드 풀.
+# 시간이 초과된 노드의 스레드는 강제로 중단할 수 없으므로 백그라운드에서 끝날 때까지 실행되고 결과는 버려집니다.
+_executor = ThreadPoolExecutor(max_workers=settings.NODE_EXECUTOR_WORKERS, thread_name_prefix="graph-node")
+# 스레드 풀의 빈 슬롯 수. 슬롯을 얻은 노드만 제출하므로 작업이 풀의 대기열에 쌓였다가
+# 이미 응답이 끝난 요청을 위해 뒤늦게 실행되는 일이 없습니다.
+_slots = threading.BoundedSemaphore(settings.NODE_EXECUTOR_WORKERS)
+
+
+def remaining_seconds(state: GraphState) -> float:
+    """요청 마감 시각까지 남은 시간(초)을 반환합니다. 마감 시각이 없으면 무한대."""
+    deadline = state.get("deadline")
+    if not deadline:
+        return float("inf")
+    return deadline - time.time()
+
+
+def mark_degraded(state: GraphState, node_name: str) -> GraphState:
+    """상태에 시간 초과로 대체 데이터를 사용한 노드를 기록합니다."""
+    state["degraded"] = list(state.get("degraded") or []) + [node_name]
+    return state
+
+
+def with_time_budget(node_name: str, node: Callable, fallback: Callable, budget_seconds: float,
+                     reserve_seconds: float = 0.0) -> Callable:
+    """
+    노드를 시간 예산 안에서 실행하도록 감쌉니다.
+
+    노드에 주어지는 시간은 min(노드 예산, 마감까지 남은 시간 - 예약 시간)입니다.
+    남은 시간이 없으면 노드를 건너뛰고, 시간이 초과되면 결과를 기다리지 않고
+    fallback(캐시 또는 부분 데이터)으로 상태를 채운 뒤 degraded로 표시합니다.
+    멈춘 노드들이 스레드 풀을 모두 차지한 경우에도 주어진 시간 안에서만 빈 슬롯을 기다리고,
+    얻지 못하면 노드를 실행하지 않고 fallback을 사용합니다.
+    시간 초과가 아닌 예외는 그대로 전파합니다.
+
+    Args:
+        node_name (str): 그래프에 등록된 노드 이름
+        node (Callable): 원래 노드 함수
+        fallback (Callable): 시간 초과 시 호출할 함수. 상태를 받아 상태를 반환합니다.
+        budget_seconds (float): 노드 하나에 허용할 최대 시간(초)
+        reserve_seconds (float): 이후 노드(최종 보고서 생성 등)를 위해 남겨둘 시간(초)
+    """
+
+    def _run_fallback(state: GraphState, reason: str) -> GraphState:
+        logger.warning(f"'{node_name}' 노드 {reason}. 대체 데이터를 사용합니다.")
+        fallback_state = dict(state)
+        try:
+            fallback_state = fallback(fallback_state)
+        except Exception as e:
+            logger.error(f"'{node_name}' 노드의 대체 처리 중 오류 발생: {e}", exc_info=True)
+        return mark_degraded(fallback_state, node_name)
+
+    @functools.wraps(node)
+    def wrapper(state: GraphState):
+        timeout = min(budget_seconds, remaining_seconds(state) - reserve_seconds)
+        if timeout <= 0:
+            return _run_fallback(state, "실행 전 요청 시간 예산 소진으로 건너뜀")
+
+        started = time.monotonic()
+        if not _slots.acquire(timeout=timeout):
+            return _run_fallback(state, f"실행 슬롯을 {timeout:.1f}초 안에 얻지 못해 건너뜀")
+        remaining = timeout - (time.monotonic() - started)
+
+        # 시간 초과 후에도 노드 스레드가 상태를 수정할 수 있으므로 복사본을 넘깁니다.
+        # 로그의 request_id 등 컨텍스트 변수가 노드 스레드에도 전달되도록 현재 컨텍스트에서 실행합니다.
+        context = contextvars.copy_context()
+        try:
+            future = _executor.submit(context.run, node, dict(state))
+        except Exception:
+            _slots.release()
+            raise
+        # 노드가 끝나거나 취소되면 슬롯을 반납합니다.
+        future.add_done_callback(lambda _: _slots.release())
+        try:
+            return future.result(timeout=max(remaining, 0))
+        except FutureTimeoutError:
+            # 아직 시작되지 않았다면 실행되지 않도록 취소합니다.
+            future.cancel()
+            return _run_fallback(state, f"시간 초과 ({timeout:.1f}초)")
+
+    return wrapper
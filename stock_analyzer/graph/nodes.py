@@ -1,23 +1,21 @@
 import logging
 from .state import GraphState
+from .deadline import mark_degraded
 from stock_analyzer.tools.database_tools import db_query_tool
-from stock_analyzer.tools.financial_tools import financial_statement_tool
+from stock_analyzer.tools.financial_tools import financial_statement_tool, get_cached_financial_statements
+from stock_analyzer.tools.price_tools import price_history_tool, get_price_summary
 from stock_analyzer.tools.news_crawler_tools import stock_news_url_crawler_tool
 from langchain_openai import ChatOpenAI
 from config import settings
-from stock_analyzer.service import news_service
+from stock_analyzer.database import FallbackSessionLocal
+from stock_analyzer.service import news_service, analysis_service, summary_service
 
 logger = logging.getLogger(__name__)
 llm = ChatOpenAI(
     model="gpt-4.1",
     temperature=0,
-    api_key=settings.OPENAI_API_KEY
-)
-
-summary_llm = ChatOpenAI(
-    model="gpt-4.1-mini",
-    temperature=0,
-    api_key=settings.OPENAI_API_KEY
+    api_key=settings.OPENAI_API_KEY,
+    timeout=settings.LLM_TIMEOUT_SECONDS
 )
 
 
@@ -67,9 +65,32 @@ def crawl_and_update_db_node(state: GraphState):
 
 
 
+def score_news_sentiment_node(state: GraphState):
+    """
+    아직 분석되지 않은 뉴스를 배치로 분류하여 저장하고, 심볼의 뉴스 심리를 집계하는 노드.
+    """
+    logger.info("--- 노드 실행: 뉴스 분류 및 심리 집계 ---")
+    symbol = state['question']
+
+    try:
+        analysis_service.score_unscored_news(symbol, max_articles=settings.ANALYSIS_MAX_ARTICLES_PER_RUN)
+    except Exception as e:
+        logger.error(f"뉴스 분류 중 오류 발생: {e}", exc_info=True)
+
+    try:
+        counts = analysis_service.get_symbol_sentiment(symbol)
+        state['sentiment'] = analysis_service.format_sentiment(counts)
+        logger.info(f"'{symbol}' 뉴스 심리 집계: {counts}")
+    except Exception as e:
+        logger.error(f"뉴스 심리 집계 중 오류 발생: {e}", exc_info=True)
+        state['sentiment'] = "오류: 뉴스 심리를 집계할 수 없습니다."
+    return state
+
+
 def fetch_db_news_node(state: GraphState):
     """
     DB에서 최신 뉴스 3개를 가져와, 가장 최신 뉴스는 원문을, 이전 2개는 요약하는 노드.
+    가장 최신 뉴스도 SUMMARY_RAW_MAX_CHARS보다 길면 요약하며, 긴 기사는 조각 단위로 나누어 요약합니다.
     """
     logger.info("--- 노드 실행: DB 뉴스 조회 및 부분 요약 ---")
     question = state['question']
@@ -77,21 +98,23 @@ def fetch_db_news_node(state: GraphState):
     try:
         # 1. Text-to-SQL 도구를 사용하여 최신 뉴스 3개를 가져오도록 지시
         # 각 기사를 명확히 구분하기 위해 구분자(separator)를 사용하도록 요청
+        # 중복 기사 제외 조건이 없는 news 조회는 database_tools에서 실행이 거부됩니다.
         db_query = f"""
-        '{question}'에 대한 가장 최신 뉴스 3개를 news_upload_time 기준으로 알려줘. 
-        각 기사의 제목과 내용을 포함하고, 기사 사이를 '---ARTICLE SEPARATOR---'로 구분해줘.
+        '{question}'에 대한 가장 최신 뉴스 3개를 news_upload_time 기준으로 알려줘.
+        다른 기사의 중복은 duplicate_of IS NULL 조건으로 제외해줘.
+        각 기사의 작성 시각, 제목과 내용을 포함하고, 기사 사이를 '---ARTICLE SEPARATOR---'로 구분해줘.
         """
-        raw_news_text = db_query_tool.invoke(db_query)
-        logger.debug(f"DB 최신 뉴스 원문 검색 결과: {raw_news_text}")
+        raw_news_text = db_query_tool.invoke(db_query).get("output", "")
+        logger.debug("DB 최신 뉴스 원문 검색 결과: %s", raw_news_text)
 
         # 2. 가져온 뉴스가 유효한지 확인하고 처리
         if not raw_news_text or "찾을 수 없습니다" in raw_news_text or "오류" in raw_news_text:
             logger.warning("DB에서 유효한 뉴스를 찾지 못했거나 오류가 발생했습니다.")
-            state['db_result'] = raw_news_text
+            state['db_result'] = raw_news_text or "DB에 뉴스가 없습니다."
             return state
 
-        # 3. 개별 기사로 분리
-        articles = raw_news_text['output'].split('---ARTICLE SEPARATOR---')
+        # 3. 개별 기사로 분리 (최신순)
+        articles = raw_news_text.split('---ARTICLE SEPARATOR---')
         articles = [article.strip() for article in articles if article.strip()]
 
         if not articles:
@@ -99,27 +122,28 @@ def fetch_db_news_node(state: GraphState):
             return state
 
         # 4. 가장 최신 뉴스(원문)와 이전 뉴스(요약 대상) 분리
-        most_recent_news_raw = articles[0]
-        older_news_to_summarize = "\n\n".join(articles[1:])
-        
-        older_news_summary = "이전 뉴스 없음."
-        if older_news_to_summarize:
-            logger.info("이전 뉴스 요약을 시작합니다.")
-            summarization_prompt = f"""
-            다음은 이전 뉴스 기사들의 내용입니다. 각 기사의 핵심 내용을 간결하게 요약해주세요.
+        most_recent_news = articles[0]
+        older_articles = articles[1:]
+        summarize_latest = len(most_recent_news) > settings.SUMMARY_RAW_MAX_CHARS
 
-            [뉴스 원문]
-            {older_news_to_summarize}
+        # 5. 요약 대상 기사를 한 번에 map-reduce 요약 (모든 기사의 조각이 동시에 요약됩니다)
+        to_summarize = ([most_recent_news] if summarize_latest else []) + older_articles
+        summaries = []
+        if to_summarize:
+            logger.info(f"뉴스 {len(to_summarize)}건의 요약을 시작합니다.")
+            summaries = summary_service.summarize_texts(to_summarize)
+            logger.debug("뉴스 요약 결과: %s", summaries)
 
-            [요약 결과]
-            """
-            older_news_summary = summary_llm.invoke(summarization_prompt).content
-            logger.debug(f"이전 뉴스 요약 결과: {older_news_summary}")
+        most_recent_label = "가장 최신 뉴스 (원문)"
+        if summarize_latest:
+            most_recent_news = summaries.pop(0)
+            most_recent_label = "가장 최신 뉴스 (원문이 길어 요약)"
+        older_news_summary = "\n\n".join(f"- {summary}" for summary in summaries) or "이전 뉴스 없음."
 
-        # 5. 최종 결과 조합
+        # 6. 최종 결과 조합
         final_db_result = f"""
-        [가장 최신 뉴스 (원문)]
-        {most_recent_news_raw}
+        [{most_recent_label}]
+        {most_recent_news}
 
         ---
         [이전 뉴스 요약]
@@ -159,6 +183,23 @@ def fetch_financials_node(state: GraphState):
 
         return state
     
+def fetch_price_history_node(state: GraphState):
+    """
+    주어진 심볼의 일별 주가 이력을 동기화하고 기술적 지표를 계산하는 노드.
+    저장소에 없는 최근 구간만 yfinance에서 가져옵니다.
+    """
+    logger.info("--- 노드 실행: 주가 이력 조회 및 지표 계산 ---")
+    question = state["question"]
+    try:
+        price_summary = price_history_tool.invoke(question)
+        state["price_summary"] = price_summary or "정보 없음"
+        logger.info("주가 지표 계산을 완료하고 상태를 업데이트했습니다.")
+        return state
+    except Exception as e:
+        logger.error(f"주가 이력 처리 중 오류: {e}", exc_info=True)
+        state["price_summary"] = "오류: 주가 이력을 가져올 수 없습니다."
+        return state
+
 def generate_final_answer_node(state: GraphState):
     """모든 수집된 정보를 종합하여 최종 분석 보고서를 생성하는 노드"""
     logger.info("--- 노드 실행: 최종 분석 보고서 생성 ---")
@@ -184,11 +225,113 @@ def generate_final_answer_node(state: GraphState):
     [4. 현금흐름표 요약 (최근 4분기)]
     {state.get('cash_flow', '정보 없음')}
     ---
+    [5. 주가 흐름 및 기술적 지표 (일봉 기준)]
+    {state.get('price_summary', '정보 없음')}
+    ---
+    [6. 뉴스 심리 집계 (기사별 AI 분류 결과)]
+    {state.get('sentiment', '정보 없음')}
+    ---
 
+    {_degraded_prompt_note(state)}
     [심층 분석 보고서]
     (위 모든 정보를 종합하여, 질문에 대한 답변을 분석 리포트 형식으로 작성하세요.)
     """
     response = llm.invoke(final_prompt)
-    state['final_answer'] = response.content
+    state['final_answer'] = response.content + _degraded_report_note(state)
     logger.info("최종 분석 보고서 생성을 완료했습니다.")
+    return state
+
+
+def _degraded_prompt_note(state: GraphState) -> str:
+    """시간 초과로 대체 데이터를 사용한 단계가 있으면 LLM에게 알리는 문구를 만듭니다."""
+    degraded = state.get('degraded') or []
+    if not degraded:
+        return ""
+    return (f"[참고] 다음 단계는 시간 초과로 이전에 저장된 데이터 또는 부분 데이터를 사용했습니다: "
+            f"{', '.join(degraded)}. 해당 정보의 최신성이 떨어질 수 있음을 보고서에 명시하세요.\n")
+
+
+def _degraded_report_note(state: GraphState) -> str:
+    """보고서 끝에 붙일 degraded 안내 문구를 만듭니다."""
+    degraded = state.get('degraded') or []
+    if not degraded:
+        return ""
+    return f"\n\n---\n※ 일부 단계가 시간 제한을 초과하여 저장된 데이터 또는 부분 데이터로 대체되었습니다: {', '.join(degraded)}"
+
+
+# --- 시간 예산 초과 시 사용하는 대체(fallback) 처리 ---
+# 외부 서비스(웹, yfinance, LLM)를 호출하지 않고 이미 저장된 데이터만 사용합니다.
+# 대체 처리는 요청 스레드에서 실행되므로 DB 조회는 FallbackSessionLocal(FALLBACK_DB_TIMEOUT_SECONDS 제한)로 하고,
+# 실패하면 고정된 안내 문구를 사용합니다.
+
+def crawl_and_update_db_fallback(state: GraphState):
+    """크롤링을 건너뛰고 DB에 이미 저장된 뉴스를 사용합니다."""
+    return state
+
+
+def score_news_sentiment_fallback(state: GraphState):
+    """새 뉴스 분류는 건너뛰고, 이미 저장된 분석 결과만 집계합니다."""
+    try:
+        counts = analysis_service.get_symbol_sentiment(state['question'], session_factory=FallbackSessionLocal)
+    except Exception as e:
+        logger.warning(f"대체 처리 중 뉴스 심리 집계 실패: {e}")
+        state['sentiment'] = "정보 없음 (시간 초과)"
+        return state
+    state['sentiment'] = analysis_service.format_sentiment(counts)
+    return state
+
+
+def fetch_financials_fallback(state: GraphState):
+    """마지막으로 성공한 재무제표 조회 결과(FINANCIAL_CACHE_DIR에 저장)를 사용합니다."""
+    cached = get_cached_financial_statements(state['question'])
+    state["income_statement"] = cached.get("income_statement", "정보 없음 (시간 초과)")
+    state["balance_sheet"] = cached.get("balance_sheet", "정보 없음 (시간 초과)")
+    state["cash_flow"] = cached.get("cash_flow", "정보 없음 (시간 초과)")
+    return state
+
+
+def fetch_price_history_fallback(state: GraphState):
+    """yfinance 동기화 없이 저장소에 있는 주가 이력으로 지표를 계산합니다."""
+    state["price_summary"] = get_price_summary(state['question'], sync=False) or "정보 없음 (시간 초과)"
+    return state
+
+
+def fetch_db_news_fallback(state: GraphState):
+    """
+    Text-to-SQL 에이전트와 요약 LLM 없이 news_service로 최신 뉴스(중복 기사 제외)를 직접 조회하여
+    기사마다 앞부분만 사용합니다.
+    """
+    try:
+        articles = news_service.get_latest_news(state['question'], limit=3, session_factory=FallbackSessionLocal)
+    except Exception as e:
+        logger.warning(f"대체 처리 중 DB 뉴스 조회 실패: {e}")
+        state['db_result'] = "정보 없음 (시간 초과)"
+        return state
+    if not articles:
+        state['db_result'] = "DB에 뉴스가 없습니다."
+        return state
+    max_chars = settings.FALLBACK_NEWS_MAX_CHARS
+    state['db_result'] = "\n\n---\n".join(
+        f"[{article['upload_time']}] {article['title']}\n{article['content'][:max_chars]}"
+        for article in articles
+    )
+    return state
+
+
+def generate_final_answer_fallback(state: GraphState):
+    """LLM 없이 수집된 데이터를 그대로 정리한 보고서를 만듭니다."""
+    sections = [
+        ("뉴스", state.get('db_result')),
+        ("뉴스 심리", state.get('sentiment')),
+        ("주가 흐름 및 기술적 지표", state.get('price_summary')),
+        ("재무상태표", state.get('balance_sheet')),
+        ("손익계산서", state.get('income_statement')),
+        ("현금흐름표", state.get('cash_flow')),
+    ]
+    body = "\n\n".join(f"### {title}\n{content or '정보 없음'}" for title, content in sections)
+    state['final_answer'] = (
+        f"## {state['question']} 수집 데이터 요약\n"
+        f"(분석 보고서 생성이 시간 제한을 초과하여 수집된 데이터만 제공합니다.)\n\n{body}"
+        + _degraded_report_note(mark_degraded(dict(state), "generate_answer"))
+    )
     return state
\ No newline at end of file
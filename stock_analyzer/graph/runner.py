@@ -0,0 +1,70 @@
+import logging
+import time
+import uuid
+from typing import Optional
+from config import settings
+from .checkpoint import checkpoint_age_seconds, get_lease_store
+from .state import create_initial_state
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ANSWER = "분석 결과를 생성하지 못했습니다."
+
+
+def run_analysis_graph(app, symbol: str, run_id: Optional[str] = None) -> str:
+    """
+    컴파일된 그래프로 주어진 심볼의 분석 워크플로우를 실행하고 최종 보고서를 반환합니다.
+
+    체크포인터가 있는 그래프에서 같은 run_id로 다시 호출하면, 마지막 체크포인트가
+    CHECKPOINT_FRESHNESS_SECONDS 이내인 경우 이전 실행을 재사용합니다.
+      - 이전 실행이 중간에 실패했다면 마지막으로 완료된 노드 다음부터 이어서 실행합니다.
+      - 이전 실행이 완료되었다면 저장된 보고서를 그대로 반환합니다.
+    같은 run_id의 실행이 아직 진행 중이면 RunInProgressError를 발생시킵니다.
+
+    Args:
+        app: get_graph_app()으로 생성한 그래프 애플리케이션
+        symbol (str): 분석할 주식 심볼 (예: "AAPL")
+        run_id (Optional[str]): 재시도 시 이어서 실행할 실행 ID. 없으면 새로 생성합니다.
+
+    Returns:
+        str: 최종 분석 보고서
+    """
+    if app.checkpointer is None:
+        return _stream(app, create_initial_state(symbol), None)
+
+    config = {"configurable": {"thread_id": run_id or uuid.uuid4().hex}}
+    with get_lease_store().hold(config["configurable"]["thread_id"]):
+        return _run_with_checkpoint(app, symbol, config)
+
+
+def _run_with_checkpoint(app, symbol: str, config) -> str:
+    """체크포인트 상태에 따라 이전 결과를 재사용하거나, 이어서 실행하거나, 새로 실행합니다."""
+    snapshot = app.get_state(config)
+    reusable = (
+        snapshot.values.get("question") == symbol
+        and checkpoint_age_seconds(snapshot.created_at) <= settings.CHECKPOINT_FRESHNESS_SECONDS
+    )
+
+    if reusable and not snapshot.next and snapshot.values.get("final_answer"):
+        logger.info(f"실행 '{config['configurable']['thread_id']}'의 완료된 결과를 재사용합니다.")
+        return snapshot.values["final_answer"]
+
+    if reusable and snapshot.next:
+        logger.info(f"실행 '{config['configurable']['thread_id']}'을 '{snapshot.next[0]}' 노드부터 이어서 실행합니다.")
+        # 이전 실행의 마감 시각은 이미 지났으므로 새 마감 시각을 설정합니다.
+        app.update_state(config, {"deadline": time.time() + settings.REQUEST_DEADLINE_SECONDS})
+        return _stream(app, None, config)
+
+    return _stream(app, create_initial_state(symbol), config)
+
+
+def _stream(app, graph_input, config) -> str:
+    """그래프를 실행하고 최종 상태에서 보고서를 꺼냅니다."""
+    final_answer = DEFAULT_ANSWER
+    for event in app.stream(graph_input, config):
+        for key in event:
+            logger.info(f"--- 노드: '{key}' 실행 완료 ---")
+        # 'generate_answer' 노드가 실행된 이벤트에서 최종 결과를 찾습니다.
+        if "generate_answer" in event:
+            final_answer = event["generate_answer"].get('final_answer', final_answer)
+    return final_answer
@@ -1,5 +1,7 @@
-from typing import TypedDict, Annotated, List
+from typing import TypedDict, Annotated, List, Optional
 import operator
+import time
+from config import settings
 
 class GraphState(TypedDict):
     """
@@ -10,17 +12,45 @@ class GraphState(TypedDict):
         question: 사용자의 원본 질문
         crawled_urls: 크롤링된 뉴스 URL 목록
         db_result: 데이터베이스 검색 결과
+        sentiment: 뉴스 분석 결과(AnalysisResults) 집계 요약
         income_statement: 재무상태표 결과
         balance_sheet: 손익계산서 결과
         cash_flow: 현금흐름표 결과
+        price_summary: 주가 흐름 및 기술적 지표 요약
         final_answer: 최종 생성된 분석 답변
+        deadline: 요청 마감 시각 (유닉스 타임스탬프)
+        degraded: 시간 초과로 대체 데이터를 사용한 노드 목록
     """
     question: str
     crawled_urls: List[str]
     db_result: str
+    sentiment: str
     income_statement: str
     balance_sheet: str
     cash_flow: str
+    price_summary: str
     final_answer: str
+    deadline: float
+    degraded: List[str]
 
 
+def create_initial_state(symbol: str, deadline_seconds: Optional[float] = None) -> GraphState:
+    """
+    그래프 실행을 위한 초기 상태를 생성합니다.
+    모든 값은 빈 문자열로 시작하며, 각 노드를 거치면서 채워집니다.
+    마감 시각은 지금부터 deadline_seconds(기본값: REQUEST_DEADLINE_SECONDS) 후로 설정됩니다.
+    """
+    deadline_seconds = deadline_seconds or settings.REQUEST_DEADLINE_SECONDS
+    return {
+        "question": symbol,
+        "crawled_urls": [],
+        "db_result": "",
+        "sentiment": "",
+        "balance_sheet": "",
+        "income_statement": "",
+        "cash_flow": "",
+        "price_summary": "",
+        "final_answer": "",
+        "deadline": time.time() + deadline_seconds,
+        "degraded": []
+    }
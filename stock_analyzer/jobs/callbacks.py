@@ -0,0 +1,44 @@
+import logging
+from urllib.parse import urlsplit
+
+import requests
+
+from config import settings
+from stock_analyzer.jobs.queue import Job
+
+logger = logging.getLogger(__name__)
+
+
+def validate_callback_url(url: str):
+    """
+    웹훅 URL이 http/https이고 JOB_CALLBACK_ALLOWED_HOSTS에 있는 호스트인지 확인합니다.
+    허용되지 않으면 ValueError를 발생시킵니다.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise ValueError("웹훅 URL은 http 또는 https여야 합니다.")
+    host = (parts.hostname or "").lower()
+    for allowed in settings.JOB_CALLBACK_ALLOWED_HOSTS:
+        if host == allowed or (allowed.startswith(".") and host.endswith(allowed)):
+            return
+    raise ValueError(f"허용되지 않은 웹훅 호스트입니다: {host or url}")
+
+
+def notify_callback(job: Job):
+    """작업에 웹훅 URL이 있으면 작업 상태와 결과를 POST합니다. 실패해도 작업 결과에는 영향을 주지 않습니다."""
+    if not job.callback_url:
+        return
+    try:
+        # 등록 이후 허용 목록이 바뀌었을 수 있으므로 전송 직전에 다시 확인합니다.
+        validate_callback_url(job.callback_url)
+    except ValueError as e:
+        logger.error(f"작업 '{job.job_id}'의 웹훅을 보내지 않습니다: {e}")
+        return
+    try:
+        # 허용된 호스트가 내부 주소로 리다이렉트하는 경우를 막기 위해 리다이렉트를 따라가지 않습니다.
+        response = requests.post(job.callback_url, json=job.to_dict(), timeout=settings.JOB_CALLBACK_TIMEOUT_SECONDS,
+                                 allow_redirects=False)
+        response.raise_for_status()
+        logger.info(f"작업 '{job.job_id}'의 결과를 웹훅으로 전송했습니다.")
+    except requests.exceptions.RequestException as e:
+        logger.error(f"작업 '{job.job_id}'의 웹훅 전송 실패: {e}")
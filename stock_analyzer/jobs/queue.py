@@ -0,0 +1,230 @@
+import enum
+import logging
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+@dataclass
+class Job:
+    """
+    분석 작업 한 건의 상태.
+
+    Attributes:
+        job_id: 작업 ID
+        symbol: 분석할 주식 심볼
+        status: 작업 상태
+        result: 최종 분석 보고서 (완료 시)
+        error: 마지막 오류 메시지 (실패 시)
+        callback_url: 작업 종료 시 결과를 POST할 웹훅 URL
+        attempts: 실행 시도 횟수
+        worker_id: 작업을 실행 중이거나 실행했던 워커
+        created_at / started_at / finished_at: 유닉스 타임스탬프
+    """
+    job_id: str
+    symbol: str
+    status: JobStatus
+    result: Optional[str] = None
+    error: Optional[str] = None
+    callback_url: Optional[str] = None
+    attempts: int = 0
+    worker_id: Optional[str] = None
+    created_at: Optional[float] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data["status"] = self.status.value
+        return data
+
+
+class JobQueue(ABC):
+    """
+    분석 작업 큐 인터페이스.
+    API 서버는 enqueue/get만, 워커는 claim/complete/fail만 사용합니다.
+    """
+
+    @abstractmethod
+    def enqueue(self, symbol: str, callback_url: Optional[str] = None) -> Job:
+        """작업을 큐에 넣고 생성된 작업을 반환합니다."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """작업을 조회합니다. 없으면 None을 반환합니다."""
+
+    @abstractmethod
+    def claim(self, worker_id: str) -> Optional[Job]:
+        """대기 중인 가장 오래된 작업을 실행 상태로 바꾸고 반환합니다. 없으면 None."""
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, result: str) -> Optional[Job]:
+        """
+        작업을 성공 상태로 기록합니다.
+        작업이 이 워커의 실행 상태가 아니면(시간 초과로 다른 워커에 재할당된 경우 등) 아무것도 바꾸지 않고 None을 반환합니다.
+        """
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str) -> Optional[Job]:
+        """
+        작업 실패를 기록합니다.
+        재시도 횟수가 남아 있으면 다시 대기 상태로 돌리고, 아니면 실패 상태로 기록합니다.
+        작업이 이 워커의 실행 상태가 아니면 아무것도 바꾸지 않고 None을 반환합니다.
+        """
+
+    @abstractmethod
+    def requeue_stale(self, timeout_seconds: float) -> int:
+        """워커가 비정상 종료되어 오래 실행 상태로 남은 작업을 다시 대기 상태로 돌립니다. (재시도 횟수를 넘기면 실패 처리)"""
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    로컬 SQLite 파일을 사용하는 작업 큐.
+    여러 워커 프로세스가 같은 파일을 공유하며, 작업 할당은 쓰기 트랜잭션으로 직렬화됩니다.
+    """
+
+    def __init__(self, path: Path, max_attempts: int = 3):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    symbol TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    callback_url TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker_id TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_status_created ON jobs (status, created_at)")
+
+    @contextmanager
+    def _connect(self):
+        # isolation_level=None: 트랜잭션을 BEGIN IMMEDIATE로 직접 제어합니다.
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_job(row: Optional[sqlite3.Row]) -> Optional[Job]:
+        if row is None:
+            return None
+        data = dict(row)
+        data["status"] = JobStatus(data["status"])
+        return Job(**data)
+
+    def _get(self, conn, job_id: str) -> Optional[Job]:
+        return self._to_job(conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone())
+
+    def enqueue(self, symbol: str, callback_url: Optional[str] = None) -> Job:
+        job = Job(job_id=uuid.uuid4().hex, symbol=symbol, status=JobStatus.QUEUED,
+                  callback_url=callback_url, created_at=time.time())
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, symbol, status, callback_url, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job.job_id, job.symbol, job.status.value, job.callback_url, job.created_at)
+            )
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._connect() as conn:
+            return self._get(conn, job_id)
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT job_id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (JobStatus.QUEUED.value,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = ?, worker_id = ?, started_at = ?, attempts = attempts + 1 "
+                    "WHERE job_id = ?",
+                    (JobStatus.RUNNING.value, worker_id, time.time(), row["job_id"])
+                )
+                job = self._get(conn, row["job_id"])
+                conn.execute("COMMIT")
+                return job
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def complete(self, job_id: str, worker_id: str, result: str) -> Optional[Job]:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, finished_at = ? "
+                "WHERE job_id = ? AND status = ? AND worker_id = ?",
+                (JobStatus.SUCCEEDED.value, result, time.time(), job_id, JobStatus.RUNNING.value, worker_id)
+            )
+            return self._get(conn, job_id) if cursor.rowcount else None
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> Optional[Job]:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET "
+                "status = CASE WHEN attempts < ? THEN ? ELSE ? END, "
+                "finished_at = CASE WHEN attempts < ? THEN NULL ELSE ? END, "
+                "error = ? WHERE job_id = ? AND status = ? AND worker_id = ?",
+                (self.max_attempts, JobStatus.QUEUED.value, JobStatus.FAILED.value,
+                 self.max_attempts, time.time(), error, job_id, JobStatus.RUNNING.value, worker_id)
+            )
+            return self._get(conn, job_id) if cursor.rowcount else None
+
+    def requeue_stale(self, timeout_seconds: float) -> int:
+        with self._connect() as conn:
+            now = time.time()
+            cursor = conn.execute(
+                "UPDATE jobs SET "
+                "status = CASE WHEN attempts < ? THEN ? ELSE ? END, "
+                "finished_at = CASE WHEN attempts < ? THEN NULL ELSE ? END, "
+                "error = ? WHERE status = ? AND started_at < ?",
+                (self.max_attempts, JobStatus.QUEUED.value, JobStatus.FAILED.value,
+                 self.max_attempts, now, "작업 시간 초과: 워커가 응답하지 않습니다.",
+                 JobStatus.RUNNING.value, now - timeout_seconds)
+            )
+            if cursor.rowcount:
+                logger.warning(f"오래 실행 상태로 남은 작업 {cursor.rowcount}건을 정리했습니다.")
+            return cursor.rowcount
+
+
+def get_job_queue() -> JobQueue:
+    """설정(JOB_QUEUE_BACKEND)에 맞는 작업 큐를 생성합니다."""
+    backend = settings.JOB_QUEUE_BACKEND
+    if backend == "sqlite":
+        return SQLiteJobQueue(settings.JOB_QUEUE_PATH, max_attempts=settings.JOB_MAX_ATTEMPTS)
+    raise ValueError(f"지원하지 않는 작업 큐 백엔드입니다: {backend}")
@@ -0,0 +1,108 @@
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from typing import List, Optional
+
+from config import settings
+from config.logging_config import setup_logging, set_request_id
+from stock_analyzer.graph.builder import get_graph_app
+from stock_analyzer.graph.runner import run_analysis_graph
+from stock_analyzer.jobs.callbacks import notify_callback
+from stock_analyzer.jobs.queue import Job, JobQueue, get_job_queue
+
+logger = logging.getLogger(__name__)
+
+
+def process_job(queue: JobQueue, app, job: Job, worker_id: str):
+    """
+    작업 한 건을 실행하고 결과를 큐에 기록합니다.
+    실행 중 작업이 다른 워커에 재할당되었다면 결과를 기록하지 않고 웹훅도 보내지 않습니다.
+    """
+    # 작업 ID를 상관관계 ID로 사용하여 API 요청과 워커 로그를 연결합니다.
+    set_request_id(job.job_id)
+    logger.info(f"작업 '{job.job_id}' 실행 시작: {job.symbol} (시도 {job.attempts}회)")
+    try:
+        # 작업 ID를 실행 ID로 사용하므로, 재시도된 작업은 마지막으로 완료된 노드부터 이어서 실행됩니다.
+        report = run_analysis_graph(app, job.symbol, run_id=job.job_id)
+        finished = queue.complete(job.job_id, worker_id, report)
+        logger.info(f"작업 '{job.job_id}' 완료.")
+    except Exception as e:
+        logger.error(f"작업 '{job.job_id}' 실행 중 오류 발생: {e}", exc_info=True)
+        finished = queue.fail(job.job_id, worker_id, str(e))
+
+    if finished is None:
+        logger.warning(f"작업 '{job.job_id}'이 다른 워커에 재할당되어 이 워커의 결과는 기록하지 않았습니다.")
+    elif finished.is_finished:
+        notify_callback(finished)
+
+
+def run_worker(worker_id: Optional[str] = None, stop_event=None):
+    """
+    큐에서 작업을 하나씩 가져와 그래프를 실행하는 워커 루프.
+    stop_event가 설정되면 현재 작업을 마친 뒤 종료합니다.
+    """
+    if stop_event is not None:
+        # Ctrl-C는 포그라운드 프로세스 그룹 전체에 전달되므로, 자식 워커는 SIGINT를 무시하고
+        # 부모 프로세스가 설정하는 stop_event로만 종료하여 실행 중인 작업이 중간에 끊기지 않도록 합니다.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    setup_logging()
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    queue = get_job_queue()
+    app = get_graph_app()
+    logger.info(f"작업 워커 '{worker_id}'를 시작합니다.")
+
+    while stop_event is None or not stop_event.is_set():
+        try:
+            queue.requeue_stale(settings.JOB_STALE_SECONDS)
+            job = queue.claim(worker_id)
+        except Exception as e:
+            logger.error(f"작업 큐 조회 중 오류 발생: {e}", exc_info=True)
+            job = None
+
+        if job is None:
+            time.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+            continue
+        process_job(queue, app, job, worker_id)
+
+    logger.info(f"작업 워커 '{worker_id}'를 종료합니다.")
+
+
+def start_workers(count: int, stop_event) -> List[multiprocessing.Process]:
+    """워커 프로세스 count개를 시작합니다."""
+    processes = []
+    for index in range(count):
+        process = multiprocessing.Process(
+            target=run_worker,
+            kwargs={"worker_id": f"{socket.gethostname()}-worker-{index}", "stop_event": stop_event},
+            name=f"analysis-worker-{index}",
+        )
+        process.start()
+        processes.append(process)
+    return processes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분석 작업 큐를 처리하는 워커 프로세스를 실행합니다.")
+    parser.add_argument("--workers", type=int, default=settings.JOB_WORKERS, help="실행할 워커 프로세스 수")
+    args = parser.parse_args()
+
+    setup_logging()
+    stop_event = multiprocessing.Event()
+    processes = start_workers(args.workers, stop_event)
+    logger.info(f"워커 프로세스 {len(processes)}개를 시작했습니다.")
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        logger.info("종료 요청을 받았습니다. 실행 중인 작업을 마친 뒤 워커를 종료합니다.")
+        stop_event.set()
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from sqlalchemy import (
     create_engine, Column, Integer, String, Text, DateTime,
-    ForeignKey, BigInteger, Enum as SQLAlchemyEnum, DECIMAL
+    ForeignKey, BigInteger, Enum as SQLAlchemyEnum, DECIMAL, Index
 )
 from sqlalchemy.dialects.mysql import LONGTEXT
 from sqlalchemy.orm import relationship, declarative_base
@@ -11,8 +11,8 @@ Base = declarative_base()
 
 # 분석 결과 예측을 위한 Enum 정의
 class PredictionEnum(enum.Enum):
-    RISE = "RISE",
-    FALL = "FALL",
+    RISE = "RISE"
+    FALL = "FALL"
     NEUTRAL = "NEUTRAL"
 
 class Stock(Base):
@@ -34,17 +34,44 @@ class News(Base):
     SQL 스키마에 맞춰 컬럼명과 관계를 수정했습니다.
     """
     __tablename__ = 'news'
+    # 주의: 아래 선언은 파티션 전 스키마입니다. news_partition_service.partition_news_table을 실행한 DB에서는
+    #   - 기본 키가 (news_id, news_upload_time)이고 news_upload_time이 NOT NULL입니다.
+    #   - url은 UNIQUE가 아닌 일반 인덱스(ix_news_url)이며, 중복 URL은 크롤링 단계에서 걸러냅니다.
+    #   - news와 연결된 외래 키(stock_id, analysis_results.news_id)가 없고 관계는 ORM 수준에서만 유지됩니다.
+    # news_id는 AUTO_INCREMENT로 여전히 유일하므로 ORM은 news_id만으로 행을 식별합니다.
+    # create_all/migrate_schema는 파티션된 테이블의 기본 키와 제약을 되돌리지 않습니다.
     news_id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String(300), nullable=False)
     content = Column(LONGTEXT, nullable=False) # 긴 텍스트는 Text 타입이 더 유연합니다.
     url = Column(String(300), nullable=False, unique=True)
     stock_id = Column(Integer, ForeignKey("stock.stock_id"), nullable=False)
     news_upload_time = Column(DateTime, default=None)
+    # 보존 기간이 지나 본문을 아카이브로 옮긴 경우 content는 비워지고 아래 값이 채워집니다.
+    archived_at = Column(DateTime, default=None)
+    archive_ref = Column(String(300), default=None)
+    # 본문 SimHash 지문(16진수)과 근접 중복 검색용 16비트 밴드 값. 중복 기사는 밴드를 비워 검색 대상에서 제외합니다.
+    content_simhash = Column(String(16), default=None)
+    simhash_band_0 = Column(Integer, default=None)
+    simhash_band_1 = Column(Integer, default=None)
+    simhash_band_2 = Column(Integer, default=None)
+    simhash_band_3 = Column(Integer, default=None)
+    # 다른 URL로 재배포된 기사이면 원본 기사의 news_id. (파티션 테이블 제약으로 외래 키는 두지 않습니다)
+    duplicate_of = Column(Integer, default=None)
 
     # 관계 설정: 뉴스는 하나의 주식과 하나의 분석 결과를 가짐
     stock = relationship("Stock", back_populates="news")
     analysis = relationship("AnalysisResults", back_populates="news_article", uselist=False, cascade="all, delete-orphan")
 
+    # 심볼별 최신 뉴스 조회(news_upload_time 정렬)를 위한 인덱스
+    __table_args__ = (
+        Index("ix_news_stock_upload_time", "stock_id", "news_upload_time"),
+        # 밴드 값 중 하나라도 같은 기사를 찾는 근접 중복 검색용 인덱스
+        Index("ix_news_stock_simhash_band_0", "stock_id", "simhash_band_0"),
+        Index("ix_news_stock_simhash_band_1", "stock_id", "simhash_band_1"),
+        Index("ix_news_stock_simhash_band_2", "stock_id", "simhash_band_2"),
+        Index("ix_news_stock_simhash_band_3", "stock_id", "simhash_band_3"),
+    )
+
 class AnalysisResults(Base):
     """
     AI의 분석 결과를 저장하는 테이블 모델.
@@ -0,0 +1,268 @@
+import contextvars
+import logging
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Literal, Optional
+
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel, Field
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from config import settings
+from stock_analyzer.database import SessionLocal
+from stock_analyzer.models import AnalysisResults, News, PredictionEnum, Stock
+
+logger = logging.getLogger(__name__)
+
+
+class ArticlePrediction(BaseModel):
+    """기사 한 건에 대한 주가 영향 예측"""
+    news_id: int = Field(description="입력으로 주어진 기사의 news_id")
+    prediction: Literal["RISE", "FALL", "NEUTRAL"] = Field(description="해당 기사가 주가에 미칠 영향")
+    reasoning: str = Field(description="예측 근거를 한두 문장으로 요약")
+
+
+class BatchPrediction(BaseModel):
+    """여러 기사에 대한 예측 결과 목록"""
+    results: List[ArticlePrediction]
+
+
+# 동시에 여러 배치를 보내더라도 OpenAI 호출 속도를 제한합니다.
+rate_limiter = InMemoryRateLimiter(
+    requests_per_second=settings.ANALYSIS_REQUESTS_PER_SECOND,
+    check_every_n_seconds=0.1,
+    max_bucket_size=settings.ANALYSIS_MAX_CONCURRENCY
+)
+
+# 같은 심볼을 동시에 분석하는 요청들이 같은 뉴스를 중복 분류(LLM 비용 중복)하지 않도록 심볼별 락을 둡니다.
+_symbol_locks: Dict[str, threading.Lock] = {}
+_symbol_locks_guard = threading.Lock()
+
+
+def _get_symbol_lock(symbol: str) -> threading.Lock:
+    with _symbol_locks_guard:
+        return _symbol_locks.setdefault(symbol, threading.Lock())
+
+
+classifier_llm = ChatOpenAI(
+    model="gpt-4.1-mini",
+    temperature=0,
+    api_key=settings.OPENAI_API_KEY,
+    rate_limiter=rate_limiter,
+    timeout=settings.LLM_TIMEOUT_SECONDS
+).with_structured_output(BatchPrediction)
+
+
+def fetch_unscored_news(symbol: Optional[str] = None, limit: int = 100, after_id: int = 0) -> List[Dict]:
+    """
+    아직 분석 결과가 없는 뉴스를 news_id 오름차순으로 조회합니다.
+    본문이 아카이브된 오래된 뉴스와 다른 기사의 중복으로 연결된 뉴스는 제외합니다.
+
+    Args:
+        symbol (Optional[str]): 특정 심볼로 제한할 경우 지정
+        limit (int): 최대 조회 건수
+        after_id (int): 이 news_id보다 큰 뉴스만 조회
+
+    Returns:
+        List[Dict]: 'news_id', 'symbol', 'title', 'content' 키를 가진 딕셔너리 목록
+    """
+    db: Session = SessionLocal()
+    try:
+        query = (
+            db.query(News.news_id, Stock.symbol, News.title, News.content)
+            .join(Stock, News.stock_id == Stock.stock_id)
+            .outerjoin(AnalysisResults, AnalysisResults.news_id == News.news_id)
+            .filter(AnalysisResults.analysis_id.is_(None), News.archived_at.is_(None),
+                    News.duplicate_of.is_(None), News.news_id > after_id)
+        )
+        if symbol:
+            query = query.filter(Stock.symbol == symbol)
+        rows = query.order_by(News.news_id).limit(limit).all()
+        return [
+            {"news_id": row.news_id, "symbol": row.symbol, "title": row.title, "content": row.content}
+            for row in rows
+        ]
+    finally:
+        db.close()
+
+
+def build_batch_prompt(articles: List[Dict]) -> str:
+    """여러 기사를 하나의 분류 프롬프트로 묶습니다. 본문은 설정된 길이까지만 포함합니다."""
+    max_chars = settings.ANALYSIS_MAX_ARTICLE_CHARS
+    article_blocks = "\n\n".join(
+        f"[news_id: {article['news_id']} | 종목: {article['symbol']}]\n"
+        f"제목: {article['title']}\n"
+        f"본문: {article['content'][:max_chars]}"
+        for article in articles
+    )
+    return f"""
+    당신은 주식 뉴스 분석가입니다. 아래 각 기사가 해당 종목의 단기 주가에 미칠 영향을 판단하세요.
+    각 기사마다 news_id를 그대로 사용하여 RISE(상승), FALL(하락), NEUTRAL(중립) 중 하나와 그 근거를 작성해야 합니다.
+    모든 기사에 대해 빠짐없이 하나씩 결과를 반환하세요.
+
+    [기사 목록]
+    {article_blocks}
+    """
+
+
+def classify_batch(articles: List[Dict]) -> List[Dict]:
+    """
+    기사 묶음을 한 번의 LLM 호출로 분류합니다.
+    입력에 없는 news_id나 중복된 결과는 버립니다.
+    """
+    response: BatchPrediction = classifier_llm.invoke(build_batch_prompt(articles))
+    expected_ids = {article["news_id"] for article in articles}
+    now = datetime.now()
+
+    rows = []
+    for result in response.results:
+        if result.news_id not in expected_ids:
+            continue
+        expected_ids.discard(result.news_id)
+        rows.append({
+            "news_id": result.news_id,
+            "create_at": now,
+            "prediction": PredictionEnum[result.prediction],
+            "reasoning": result.reasoning,
+        })
+
+    if expected_ids:
+        logger.warning(f"LLM 응답에서 {len(expected_ids)}개 기사의 분석 결과가 누락되었습니다: {sorted(expected_ids)}")
+    return rows
+
+
+def save_predictions(rows: List[Dict]):
+    """분석 결과를 한 번의 INSERT로 저장합니다. 이미 결과가 있는 뉴스는 건너뜁니다."""
+    if not rows:
+        return
+    db: Session = SessionLocal()
+    try:
+        # 다른 작업이 먼저 같은 뉴스를 분석했더라도 unique 제약 위반으로 배치 전체가 실패하지 않도록 합니다.
+        statement = insert(AnalysisResults).prefix_with("IGNORE", dialect="mysql")
+        db.execute(statement, rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def score_unscored_news(symbol: Optional[str] = None, max_articles: Optional[int] = None) -> int:
+    """
+    분석 결과가 없는 뉴스를 배치 단위로 묶어 동시에 분류하고 결과를 저장합니다.
+    배치가 끝날 때마다 저장하므로, 중간에 중단되어도 다음 실행 시 남은 뉴스부터 이어서 처리합니다.
+    심볼을 지정하면 같은 프로세스에서 같은 심볼의 분류는 한 번에 하나만 실행됩니다.
+    나중에 온 호출은 앞선 분류가 끝날 때까지 기다린 뒤 남은 뉴스만 처리합니다.
+
+    Args:
+        symbol (Optional[str]): 특정 심볼의 뉴스만 처리할 경우 지정
+        max_articles (Optional[int]): 이번 실행에서 처리할 최대 기사 수
+
+    Returns:
+        int: 저장한 분석 결과 수
+    """
+    with _get_symbol_lock(symbol) if symbol else nullcontext():
+        return _score_unscored_news(symbol, max_articles)
+
+
+def _score_unscored_news(symbol: Optional[str], max_articles: Optional[int]) -> int:
+    batch_size = settings.ANALYSIS_BATCH_SIZE
+    concurrency = settings.ANALYSIS_MAX_CONCURRENCY
+    scored = 0
+    processed = 0
+    last_id = 0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while max_articles is None or processed < max_articles:
+            page_size = batch_size * concurrency
+            if max_articles is not None:
+                page_size = min(page_size, max_articles - processed)
+            page = fetch_unscored_news(symbol, limit=page_size, after_id=last_id)
+            if not page:
+                break
+            # 실패한 배치는 이번 실행에서 다시 시도하지 않고 다음 실행에서 처리합니다.
+            last_id = page[-1]["news_id"]
+            processed += len(page)
+
+            batches = [page[i:i + batch_size] for i in range(0, len(page), batch_size)]
+            futures = {
+                executor.submit(contextvars.copy_context().run, classify_batch, batch): batch
+                for batch in batches
+            }
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    rows = future.result()
+                    save_predictions(rows)
+                    scored += len(rows)
+                except Exception as e:
+                    batch_ids = [article["news_id"] for article in batch]
+                    logger.error(f"뉴스 배치 분류 중 오류 발생 (news_id: {batch_ids}): {e}", exc_info=True)
+
+    logger.info(f"뉴스 {processed}건을 분류하여 {scored}건의 분석 결과를 저장했습니다.")
+    return scored
+
+
+def get_symbol_sentiment(symbol: str, days: Optional[int] = None,
+                         session_factory: Callable[[], Session] = SessionLocal) -> Dict[str, int]:
+    """
+    심볼의 최근 뉴스 분석 결과를 예측 값별로 집계합니다.
+
+    Args:
+        symbol (str): 주식 심볼
+        days (Optional[int]): 집계할 기간(일). 지정하지 않으면 설정값을 사용합니다.
+        session_factory (Callable[[], Session]): DB 세션 생성 함수 (대체 처리에서는 시간 제한이 있는 세션 사용)
+
+    Returns:
+        Dict[str, int]: {'RISE': n, 'FALL': n, 'NEUTRAL': n}
+    """
+    days = days or settings.ANALYSIS_SENTIMENT_DAYS
+    cutoff = datetime.now() - timedelta(days=days)
+    db: Session = session_factory()
+    try:
+        rows = (
+            db.query(AnalysisResults.prediction, func.count(AnalysisResults.analysis_id))
+            .join(News, AnalysisResults.news_id == News.news_id)
+            .join(Stock, News.stock_id == Stock.stock_id)
+            .filter(Stock.symbol == symbol, News.news_upload_time >= cutoff, News.duplicate_of.is_(None))
+            .group_by(AnalysisResults.prediction)
+            .all()
+        )
+    finally:
+        db.close()
+
+    counts = {prediction.name: 0 for prediction in PredictionEnum}
+    for prediction, count in rows:
+        if prediction is not None:
+            counts[prediction.name] = count
+    return counts
+
+
+def format_sentiment(counts: Dict[str, int], days: Optional[int] = None) -> str:
+    """집계 결과를 보고서에 넣기 좋은 문자열로 변환합니다."""
+    days = days or settings.ANALYSIS_SENTIMENT_DAYS
+    total = sum(counts.values())
+    if total == 0:
+        return f"최근 {days}일간 분석된 뉴스가 없습니다."
+    score = (counts["RISE"] - counts["FALL"]) / total
+    return (
+        f"최근 {days}일 뉴스 {total}건: 상승 {counts['RISE']}건, 하락 {counts['FALL']}건, "
+        f"중립 {counts['NEUTRAL']}건 (순 심리 점수 {score:+.2f})"
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+    from config.logging_config import setup_logging
+
+    setup_logging()
+    parser = argparse.ArgumentParser(description="분석 결과가 없는 뉴스를 배치로 분류합니다.")
+    parser.add_argument("--symbol", help="특정 심볼의 뉴스만 처리")
+    parser.add_argument("--max-articles", type=int, help="이번 실행에서 처리할 최대 기사 수")
+    args = parser.parse_args()
+    score_unscored_news(args.symbol, args.max_articles)
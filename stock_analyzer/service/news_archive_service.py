@@ -0,0 +1,158 @@
+import gzip
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from config import settings
+from stock_analyzer.database import SessionLocal
+from stock_analyzer.models import News
+
+logger = logging.getLogger(__name__)
+
+
+class NewsArchiveStore:
+    """
+    보존 기간이 지난 뉴스 본문을 저장하는 로컬 압축 아카이브.
+
+    본문은 기사마다 독립된 gzip 멤버로 압축되어 `<NEWS_ARCHIVE_DIR>/<YYYY-MM>/segment-*.gz`
+    파일에 이어 붙여집니다. 각 기사는 "상대경로:오프셋:길이" 형식의 참조(archive_ref)로
+    파일 전체를 풀지 않고 바로 읽을 수 있습니다.
+    """
+
+    def __init__(self, base_dir: Optional[Path] = None):
+        self.base_dir = Path(base_dir or settings.NEWS_ARCHIVE_DIR)
+
+    def write_batch(self, articles: List[Dict]) -> Dict[int, str]:
+        """
+        기사 본문들을 업로드 월별 세그먼트 파일에 기록합니다.
+
+        Args:
+            articles (List[Dict]): 'news_id', 'news_upload_time', 'content' 키를 가진 딕셔너리 목록
+
+        Returns:
+            Dict[int, str]: news_id별 archive_ref
+        """
+        by_month: Dict[str, List[Dict]] = {}
+        for article in articles:
+            by_month.setdefault(f"{article['news_upload_time']:%Y-%m}", []).append(article)
+
+        refs: Dict[int, str] = {}
+        # 동시에 실행된 다른 보존 작업과 파일이 겹치지 않도록 세그먼트 이름에 시각과 pid를 넣습니다.
+        segment_name = f"segment-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}.gz"
+        for month, month_articles in by_month.items():
+            relative_path = Path(month) / segment_name
+            path = self.base_dir / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "ab") as f:
+                for article in month_articles:
+                    member = gzip.compress(article["content"].encode("utf-8"))
+                    offset = f.tell()
+                    f.write(member)
+                    refs[article["news_id"]] = f"{relative_path.as_posix()}:{offset}:{len(member)}"
+                f.flush()
+                # DB에서 본문을 지우기 전에 아카이브가 디스크에 기록되었음을 보장합니다.
+                os.fsync(f.fileno())
+        return refs
+
+    def read(self, archive_ref: str) -> str:
+        """archive_ref가 가리키는 기사 본문을 읽습니다."""
+        relative_path, offset, length = archive_ref.rsplit(":", 2)
+        with open(self.base_dir / relative_path, "rb") as f:
+            f.seek(int(offset))
+            return gzip.decompress(f.read(int(length))).decode("utf-8")
+
+
+archive_store = NewsArchiveStore()
+
+
+def load_news_content(content: str, archive_ref: Optional[str]) -> str:
+    """본문이 아카이브되었으면 아카이브에서 읽고, 아니면 DB의 본문을 그대로 반환합니다."""
+    if archive_ref:
+        try:
+            return archive_store.read(archive_ref)
+        except Exception as e:
+            logger.error(f"아카이브된 뉴스 본문을 읽는 중 오류 발생 ({archive_ref}): {e}", exc_info=True)
+    return content
+
+
+def archive_old_news(older_than_days: Optional[int] = None, batch_size: Optional[int] = None) -> int:
+    """
+    보존 기간이 지난 뉴스의 본문을 아카이브로 옮기고 DB에는 메타데이터만 남깁니다.
+    배치마다 아카이브 기록 후 커밋하므로 중간에 중단되어도 다시 실행하면 이어서 처리합니다.
+
+    Args:
+        older_than_days (Optional[int]): 이 일수보다 오래된 뉴스를 아카이브합니다. (기본값: NEWS_RETENTION_DAYS)
+        batch_size (Optional[int]): 한 번에 처리할 뉴스 수 (기본값: NEWS_ARCHIVE_BATCH_SIZE)
+
+    Returns:
+        int: 아카이브한 뉴스 수
+    """
+    older_than_days = older_than_days or settings.NEWS_RETENTION_DAYS
+    batch_size = batch_size or settings.NEWS_ARCHIVE_BATCH_SIZE
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    logger.info(f"{cutoff:%Y-%m-%d} 이전 뉴스 본문의 아카이브를 시작합니다.")
+
+    archived = 0
+    last_id = 0
+    while True:
+        db: Session = SessionLocal()
+        try:
+            rows = (
+                db.query(News.news_id, News.news_upload_time, News.content)
+                .filter(News.news_upload_time < cutoff, News.archived_at.is_(None), News.news_id > last_id)
+                .order_by(News.news_id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].news_id
+
+            articles = [
+                {"news_id": row.news_id, "news_upload_time": row.news_upload_time, "content": row.content}
+                for row in rows
+            ]
+            refs = archive_store.write_batch(articles)
+
+            now = datetime.now()
+            db.execute(update(News), [
+                {"news_id": news_id, "content": "", "archived_at": now, "archive_ref": ref}
+                for news_id, ref in refs.items()
+            ])
+            db.commit()
+            archived += len(refs)
+            logger.info(f"뉴스 {len(refs)}건의 본문을 아카이브했습니다. (누적 {archived}건)")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"뉴스 아카이브 중 오류 발생: {e}", exc_info=True)
+            raise
+        finally:
+            db.close()
+
+    logger.info(f"뉴스 아카이브를 완료했습니다. 총 {archived}건")
+    return archived
+
+
+if __name__ == "__main__":
+    import argparse
+    from config.logging_config import setup_logging
+    from stock_analyzer.service import news_partition_service
+
+    setup_logging()
+    parser = argparse.ArgumentParser(description="news 테이블 파티션 관리 및 오래된 뉴스 본문 아카이브")
+    parser.add_argument("--partition", action="store_true",
+                        help="news 테이블을 월별 파티션 테이블로 변환합니다. (MySQL, 최초 1회)")
+    parser.add_argument("--older-than-days", type=int, help="이 일수보다 오래된 뉴스 본문을 아카이브합니다.")
+    args = parser.parse_args()
+
+    if args.partition:
+        news_partition_service.partition_news_table()
+    else:
+        news_partition_service.ensure_future_partitions()
+    archive_old_news(args.older_than_days)
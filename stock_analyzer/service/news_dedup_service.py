@@ -0,0 +1,160 @@
+import hashlib
+import logging
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from config import settings
+from stock_analyzer.database import SessionLocal
+from stock_analyzer.models import News
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+# 64비트 지문을 16비트 밴드 4개로 나눕니다. 해밍 거리가 3 이하인 두 지문은
+# 비둘기집 원리에 따라 적어도 한 밴드가 완전히 같으므로, 밴드 값이 같은 기사만 비교하면 됩니다.
+BAND_COUNT = 4
+BAND_BITS = FINGERPRINT_BITS // BAND_COUNT
+BAND_COLUMNS = [getattr(News, f"simhash_band_{band}") for band in range(BAND_COUNT)]
+SHINGLE_SIZE = 3
+TOKEN_PATTERN = re.compile(r"\w+")
+# 중복 기사는 본문 없이 저장되므로 news 테이블을 읽는 SQL은 항상 중복 기사 제외 조건을 포함해야 합니다.
+NEWS_TABLE_PATTERN = re.compile(r"\b(FROM|JOIN)\s+`?news`?(?![\w`])", re.IGNORECASE)
+DUPLICATE_FILTER_PATTERN = re.compile(r"\bduplicate_of`?\s+IS\s+NULL\b", re.IGNORECASE)
+_BIT_POSITIONS = np.arange(FINGERPRINT_BITS, dtype=np.uint64)
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    본문의 단어 3-gram(shingle)으로 64비트 SimHash 지문을 계산합니다.
+    비슷한 본문은 지문의 해밍 거리가 작습니다. 단어 수가 너무 적으면 None을 반환합니다.
+    """
+    tokens = TOKEN_PATTERN.findall((text or "").lower())
+    if len(tokens) < max(settings.NEWS_DEDUP_MIN_TOKENS, SHINGLE_SIZE):
+        return None
+
+    shingles = Counter(" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1))
+    hashes = np.array([_shingle_hash(shingle) for shingle in shingles], dtype=np.uint64)
+    counts = np.array(list(shingles.values()), dtype=np.int64)
+
+    # 각 비트 위치마다 shingle 해시의 비트가 1이면 +빈도, 0이면 -빈도를 더한 뒤 양수인 비트만 1로 둡니다.
+    bits = ((hashes[:, None] >> _BIT_POSITIONS) & np.uint64(1)).astype(np.int64)
+    weights = ((bits * 2 - 1) * counts[:, None]).sum(axis=0)
+    return sum(1 << bit for bit in np.flatnonzero(weights > 0).tolist())
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def band_values(fingerprint: int) -> List[int]:
+    """지문을 BAND_COUNT개의 BAND_BITS비트 값으로 나눕니다."""
+    mask = (1 << BAND_BITS) - 1
+    return [(fingerprint >> (band * BAND_BITS)) & mask for band in range(BAND_COUNT)]
+
+
+def fingerprint_columns(fingerprint: Optional[int], indexed: bool = True) -> Dict:
+    """
+    News 모델에 저장할 지문 관련 컬럼 값을 반환합니다.
+    indexed가 False이면(중복 기사) 밴드 값을 비워 이후 검색 대상에서 제외합니다.
+    """
+    columns = {"content_simhash": None if fingerprint is None else f"{fingerprint:016x}"}
+    bands = band_values(fingerprint) if fingerprint is not None and indexed else [None] * BAND_COUNT
+    for band, value in enumerate(bands):
+        columns[f"simhash_band_{band}"] = value
+    return columns
+
+
+def find_duplicate(db: Session, stock_id: int, fingerprint: int, max_distance: Optional[int] = None) -> Optional[int]:
+    """
+    같은 종목의 기존 기사 중 지문이 max_distance 이내인 원본 기사를 찾습니다.
+    밴드 인덱스로 후보만 조회하므로 전체 기사를 비교하지 않습니다.
+
+    Returns:
+        Optional[int]: 가장 가까운 원본 기사의 news_id. 없으면 None
+    """
+    max_distance = settings.NEWS_DEDUP_MAX_DISTANCE if max_distance is None else max_distance
+    candidates = (
+        db.query(News.news_id, News.content_simhash)
+        .filter(
+            News.stock_id == stock_id,
+            or_(*[column == value for column, value in zip(BAND_COLUMNS, band_values(fingerprint))]),
+        )
+        .all()
+    )
+
+    best_id, best_distance = None, max_distance + 1
+    for candidate in candidates:
+        distance = hamming_distance(fingerprint, int(candidate.content_simhash, 16))
+        if distance < best_distance:
+            best_id, best_distance = candidate.news_id, distance
+    return best_id
+
+
+def excludes_duplicates(sql: str) -> bool:
+    """SQL이 news 테이블을 읽지 않거나, 읽는다면 duplicate_of IS NULL 조건을 포함하는지 확인합니다."""
+    return not NEWS_TABLE_PATTERN.search(sql) or bool(DUPLICATE_FILTER_PATTERN.search(sql))
+
+
+def backfill_fingerprints(batch_size: int = 500) -> int:
+    """
+    지문이 없는 기존 기사에 지문을 채우고, 먼저 저장된 기사와 중복이면 duplicate_of로 연결합니다.
+    이미 분석된 기사가 있을 수 있으므로 기존 기사의 본문은 지우지 않습니다.
+
+    Returns:
+        int: 중복으로 연결한 기사 수
+    """
+    linked = 0
+    last_id = 0
+    while True:
+        db: Session = SessionLocal()
+        try:
+            articles = (
+                db.query(News)
+                .filter(News.content_simhash.is_(None), News.archived_at.is_(None),
+                        News.duplicate_of.is_(None), News.news_id > last_id)
+                .order_by(News.news_id)
+                .limit(batch_size)
+                .all()
+            )
+            if not articles:
+                break
+            last_id = articles[-1].news_id
+
+            for article in articles:
+                fingerprint = simhash(article.content)
+                if fingerprint is None:
+                    continue
+                duplicate_of = find_duplicate(db, article.stock_id, fingerprint)
+                for column, value in fingerprint_columns(fingerprint, indexed=duplicate_of is None).items():
+                    setattr(article, column, value)
+                if duplicate_of is not None:
+                    article.duplicate_of = duplicate_of
+                    linked += 1
+                # 같은 배치의 다음 기사가 이 기사의 지문을 찾을 수 있도록 바로 반영합니다.
+                db.flush()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"뉴스 지문 보충 중 오류 발생: {e}", exc_info=True)
+            raise
+        finally:
+            db.close()
+
+    logger.info(f"뉴스 지문 보충을 완료했습니다. 중복으로 연결한 기사 {linked}건")
+    return linked
+
+
+if __name__ == "__main__":
+    from config.logging_config import setup_logging
+
+    setup_logging()
+    backfill_fingerprints()
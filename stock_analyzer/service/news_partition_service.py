@@ -0,0 +1,156 @@
+import logging
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from config import settings
+from stock_analyzer.database import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+PARTITION_TABLE = "news"
+PARTITION_COLUMN = "news_upload_time"
+# news_upload_time이 비어 있던 행은 이 시각으로 채워 가장 오래된 파티션에 들어가도록 합니다.
+NULL_UPLOAD_TIME_PLACEHOLDER = "1970-01-01 00:00:00"
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def monthly_boundaries(start: date, end: date) -> List[date]:
+    """start가 속한 달의 다음 달 1일부터 end가 속한 달의 다음 달 1일까지, 월별 파티션 상한 목록을 반환합니다."""
+    boundaries = []
+    boundary = _add_months(_month_start(start), 1)
+    last = _add_months(_month_start(end), 1)
+    while boundary <= last:
+        boundaries.append(boundary)
+        boundary = _add_months(boundary, 1)
+    return boundaries
+
+
+def partition_definitions(boundaries: List[date]) -> str:
+    """
+    월별 RANGE COLUMNS 파티션 정의를 생성합니다.
+    파티션 이름은 해당 파티션에 들어가는 달(상한의 이전 달) 기준입니다. (예: p202407)
+    """
+    parts = []
+    for boundary in boundaries:
+        month = _add_months(boundary, -1)
+        parts.append(f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{boundary:%Y-%m-%d}')")
+    parts.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+    return ",\n    ".join(parts)
+
+
+def is_mysql(engine: Engine) -> bool:
+    return engine.dialect.name == "mysql"
+
+
+def get_partition_boundaries(engine: Engine) -> Optional[List[str]]:
+    """
+    news 테이블의 파티션 상한값 목록을 반환합니다. (pmax 제외)
+    파티션되어 있지 않으면 None을 반환합니다.
+    """
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL "
+            "ORDER BY PARTITION_ORDINAL_POSITION"
+        ), {"table": PARTITION_TABLE}).fetchall()
+    if not rows:
+        return None
+    return [row.PARTITION_DESCRIPTION.strip("'") for row in rows if row.PARTITION_NAME != "pmax"]
+
+
+def partition_news_table(engine: Engine = default_engine, months_ahead: Optional[int] = None):
+    """
+    MySQL의 news 테이블을 news_upload_time 기준 월별 RANGE 파티션 테이블로 변환합니다.
+
+    MySQL 파티션 테이블의 제약 때문에 다음 변경이 함께 적용됩니다.
+      - news를 참조하거나 news가 참조하는 외래 키를 제거합니다. (관계는 ORM 수준에서만 유지)
+      - 기본 키를 (news_id, news_upload_time)으로 바꾸고 news_upload_time을 NOT NULL로 변경합니다.
+      - url의 UNIQUE 제약을 일반 인덱스로 바꿉니다. (중복 URL은 크롤링 단계에서 걸러냅니다)
+
+    이미 파티션되어 있으면 미래 파티션만 보충합니다.
+    """
+    if not is_mysql(engine):
+        logger.warning(f"news 파티셔닝은 MySQL에서만 지원합니다. (현재: {engine.dialect.name})")
+        return
+    if get_partition_boundaries(engine) is not None:
+        logger.info("news 테이블이 이미 파티션되어 있습니다. 미래 파티션만 확인합니다.")
+        ensure_future_partitions(engine, months_ahead)
+        return
+
+    months_ahead = settings.NEWS_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    inspector = inspect(engine)
+
+    with engine.begin() as conn:
+        # 1. news와 연결된 외래 키 제거
+        for table in inspector.get_table_names():
+            for foreign_key in inspector.get_foreign_keys(table):
+                if table == PARTITION_TABLE or foreign_key["referred_table"] == PARTITION_TABLE:
+                    logger.info(f"외래 키 제거: {table}.{foreign_key['name']}")
+                    conn.execute(text(f"ALTER TABLE {table} DROP FOREIGN KEY {foreign_key['name']}"))
+
+        # 2. 파티션 키를 기본 키에 포함하고, 파티션 키가 없는 UNIQUE 제약을 일반 인덱스로 변경
+        conn.execute(text(
+            f"UPDATE {PARTITION_TABLE} SET {PARTITION_COLUMN} = :placeholder WHERE {PARTITION_COLUMN} IS NULL"
+        ), {"placeholder": NULL_UPLOAD_TIME_PLACEHOLDER})
+
+        alterations = [
+            f"MODIFY {PARTITION_COLUMN} DATETIME NOT NULL",
+            "DROP PRIMARY KEY",
+            f"ADD PRIMARY KEY (news_id, {PARTITION_COLUMN})",
+        ]
+        for constraint in inspector.get_unique_constraints(PARTITION_TABLE):
+            if PARTITION_COLUMN not in constraint["column_names"]:
+                columns = ", ".join(constraint["column_names"])
+                alterations.append(f"DROP INDEX {constraint['name']}")
+                alterations.append(f"ADD INDEX ix_news_{'_'.join(constraint['column_names'])} ({columns})")
+        conn.execute(text(f"ALTER TABLE {PARTITION_TABLE} " + ", ".join(alterations)))
+
+        # 3. 가장 오래된 뉴스가 속한 달부터 months_ahead개월 뒤까지 월별 파티션 생성
+        oldest = conn.execute(text(f"SELECT MIN({PARTITION_COLUMN}) FROM {PARTITION_TABLE}")).scalar()
+        today = date.today()
+        start = oldest.date() if isinstance(oldest, datetime) and oldest.year > 1970 else today
+        boundaries = monthly_boundaries(start, _add_months(today, months_ahead))
+        logger.info(f"news 테이블을 {len(boundaries) + 1}개의 파티션으로 변환합니다.")
+        conn.execute(text(
+            f"ALTER TABLE {PARTITION_TABLE} PARTITION BY RANGE COLUMNS({PARTITION_COLUMN}) (\n    "
+            f"{partition_definitions(boundaries)}\n)"
+        ))
+    logger.info("news 테이블 파티셔닝을 완료했습니다.")
+
+
+def ensure_future_partitions(engine: Engine = default_engine, months_ahead: Optional[int] = None):
+    """
+    앞으로 months_ahead개월 동안 쓸 파티션이 있도록 pmax 파티션을 분할합니다.
+    새 달의 뉴스가 pmax에 쌓이지 않도록 보존 작업과 함께 주기적으로 실행합니다.
+    """
+    if not is_mysql(engine):
+        return
+    boundaries = get_partition_boundaries(engine)
+    if boundaries is None:
+        logger.info("news 테이블이 파티션되어 있지 않아 파티션 보충을 건너뜁니다.")
+        return
+
+    months_ahead = settings.NEWS_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    target = _add_months(_month_start(date.today()), months_ahead + 1)
+    last = datetime.strptime(boundaries[-1][:10], "%Y-%m-%d").date() if boundaries else _month_start(date.today())
+    if last >= target:
+        return
+
+    new_boundaries = monthly_boundaries(last, _add_months(target, -1))
+    logger.info(f"news 테이블에 {len(new_boundaries)}개의 월별 파티션을 추가합니다.")
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"ALTER TABLE {PARTITION_TABLE} REORGANIZE PARTITION pmax INTO (\n    "
+            f"{partition_definitions(new_boundaries)}\n)"
+        ))
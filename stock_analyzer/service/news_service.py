@@ -1,11 +1,14 @@
 import  logging
-from typing import Set, Dict, List
+from typing import Callable, Set, Dict, List
 from sqlalchemy.orm import Session
 from stock_analyzer.database import SessionLocal
 from stock_analyzer.models import Stock, News
 from datetime import datetime
 import requests
 from bs4 import BeautifulSoup
+from config import settings
+from stock_analyzer.service import news_dedup_service
+from stock_analyzer.service.news_archive_service import load_news_content
 
 
 logger = logging.getLogger(__name__)
@@ -46,23 +49,67 @@ def get_urls_by_symbol(symbol: str) -> Set[str]:
     finally:
         db.close()
 
+def get_latest_news(symbol: str, limit: int = 3,
+                    session_factory: Callable[[], Session] = SessionLocal) -> List[Dict]:
+    """
+    주어진 심볼의 최신 뉴스를 LLM 없이 DB에서 직접 조회합니다.
+    다른 URL로 재배포된 중복 기사는 제외합니다.
+
+    Args:
+        symbol (str): 조회할 주식 심볼
+        limit (int): 조회할 뉴스 개수
+        session_factory (Callable[[], Session]): DB 세션 생성 함수 (대체 처리에서는 시간 제한이 있는 세션 사용)
+
+    Returns:
+        List[Dict]: 'title', 'content', 'upload_time' 키를 가진 딕셔너리 목록 (최신순)
+    """
+    db: Session = session_factory()
+    try:
+        rows = (
+            db.query(News.title, News.content, News.news_upload_time, News.archive_ref)
+            .join(Stock, News.stock_id == Stock.stock_id)
+            .filter(Stock.symbol == symbol, News.duplicate_of.is_(None))
+            .order_by(News.news_upload_time.desc())
+            .limit(limit)
+            .all()
+        )
+        return [
+            {
+                "title": row.title,
+                "content": load_news_content(row.content, row.archive_ref),
+                "upload_time": row.news_upload_time,
+            }
+            for row in rows
+        ]
+    finally:
+        db.close()
+
 def save_news_articles(news_list: List[Dict], symbol: str):
     """
     여러개의 새로운 뉴스 데이터를 데이터베이스에 한 번에 저장합니다.
 
+    본문의 SimHash 지문으로 같은 종목에 이미 저장된(또는 같은 배치의 앞선) 기사와
+    근접 중복인지 확인하고, NEWS_DEDUP_MODE에 따라 중복 기사를 처리합니다.
+      - link: 본문 없이 저장하고 duplicate_of에 원본 기사의 news_id를 기록합니다.
+              (URL이 저장되므로 다음 크롤링에서 다시 수집하지 않습니다)
+      - skip: 저장하지 않습니다.
+      - off: 중복 탐지 없이 모두 저장합니다.
+
     Args:
         news_list (List[Dcit]): 각 딕셔너리는 'title', 'content', 'url', 'upload_time' 키를 포함해야 합니다.
         symbol str: 주식 심볼
     """
+    dedup_mode = settings.NEWS_DEDUP_MODE
     db: Session = SessionLocal()
     try:
-        for news_item in news_list:
-            # symbol을 사용하여 stock_id를 찾습니다.
-            stock = db.query(Stock).filter(Stock.symbol == symbol).first()
-            if not stock:
-                logger.error(f"뉴스 저장 실패: '{symbol}' 심볼을 DB에서 찾을 수 없습니다.")
-                continue
+        # symbol을 사용하여 stock_id를 찾습니다.
+        stock = db.query(Stock).filter(Stock.symbol == symbol).first()
+        if not stock:
+            logger.error(f"뉴스 저장 실패: '{symbol}' 심볼을 DB에서 찾을 수 없습니다.")
+            return
 
+        saved, duplicates = 0, 0
+        for news_item in news_list:
             # 날짜 파싱
             upload_time_str = news_item.get('upload_time')
             upload_time_obj = datetime.now() # 기본값은 현재 시간
@@ -76,18 +123,38 @@ def save_news_articles(news_list: List[Dict], symbol: str):
                     logger.warning(f"날짜 형식 파싱 실패: '{upload_time_str}'. 현재 시간으로 대체합니다.")
 
 
+            content = news_item.get('content', 'N/A')
+            fingerprint, duplicate_of = None, None
+            if dedup_mode != "off":
+                fingerprint = news_dedup_service.simhash(content)
+                if fingerprint is not None:
+                    duplicate_of = news_dedup_service.find_duplicate(db, stock.stock_id, fingerprint)
+
+            if duplicate_of is not None:
+                duplicates += 1
+                logger.info(f"중복 기사 발견: '{news_item.get('url')}' → news_id {duplicate_of}")
+                if dedup_mode == "skip":
+                    continue
+                content = ""
+
             # 새로운 News 객체를 생성
             new_article = News(
                 stock_id=stock.stock_id,
                 title=news_item.get('title', 'N/A'),
-                content=news_item.get('content', 'N/A'),
+                content=content,
                 url=news_item.get('url', 'N/A'),
-                news_upload_time=upload_time_obj
+                news_upload_time=upload_time_obj,
+                duplicate_of=duplicate_of,
+                **news_dedup_service.fingerprint_columns(fingerprint, indexed=duplicate_of is None),
             )
             db.add(new_article)
+            saved += 1
+            # 같은 배치의 다음 기사가 이 기사와의 중복 여부를 조회할 수 있도록 바로 반영합니다.
+            if fingerprint is not None:
+                db.flush()
 
         db.commit()
-        logger.info(f"총 {len(news_list)}개의 뉴스 항목을 DB에 저장했습니다.")
+        logger.info(f"총 {saved}개의 뉴스 항목을 DB에 저장했습니다. (중복 {duplicates}건, 처리 방식: {dedup_mode})")
     except Exception as e:
         logger.error(f"뉴스 저장 중 오류 발생: {e}", exc_info=True)
         db.rollback()
@@ -107,7 +174,7 @@ def crawl_full_content(url: str) -> Dict:
     logger.info(f"상세 내용 크롤링 시작: {url}")
     request_url = "https://www.stocktitan.net" + url
 
-    response = requests.get(request_url)
+    response = requests.get(request_url, timeout=settings.HTTP_TIMEOUT_SECONDS)
     if response.status_code != 200:
         logger.error(f"URL {url}에 접근 중 네트워크 오류 발생: {response.status_code}")
         raise Exception(f"URL {url}에 접근 중 네트워크 오류 발생: {response.status_code}")
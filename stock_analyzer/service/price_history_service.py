@@ -0,0 +1,202 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 컬럼별 파일 이름과 dtype. date는 1970-01-01 기준 일(day) 수입니다.
+COLUMNS = {
+    "date": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8"),
+}
+
+# 저장 경로에 쓰이므로 영문 대문자/숫자로 시작하고 '.', '-'만 포함하는 심볼만 허용합니다. (예: AAPL, BRK.B)
+SYMBOL_PATTERN = re.compile(r"^[A-Z0-9][A-Z0-9.\-]{0,9}$")
+
+# 같은 프로세스 안에서 한 심볼을 동시에 동기화하지 않도록 심볼별 락을 둡니다.
+_symbol_locks: Dict[str, threading.Lock] = {}
+_symbol_locks_guard = threading.Lock()
+
+
+def _get_symbol_lock(symbol: str) -> threading.Lock:
+    with _symbol_locks_guard:
+        return _symbol_locks.setdefault(symbol, threading.Lock())
+
+
+class PriceHistoryStore:
+    """
+    심볼별 일봉(OHLCV)을 컬럼 단위 바이너리 파일에 append-only로 저장하는 저장소.
+
+    각 컬럼은 `<PRICE_DATA_DIR>/<SYMBOL>/<column>.bin` 파일 하나에 연속으로 기록되며,
+    읽을 때는 np.memmap으로 매핑하여 복사 없이 배열 연산에 사용할 수 있습니다.
+    """
+
+    def __init__(self, symbol: str, base_dir: Optional[Path] = None):
+        self.symbol = symbol.upper()
+        if not SYMBOL_PATTERN.match(self.symbol):
+            raise ValueError(f"올바르지 않은 주식 심볼입니다: {symbol!r}")
+        base_dir = Path(base_dir or settings.PRICE_DATA_DIR).resolve()
+        self.path = (base_dir / self.symbol).resolve()
+        if self.path.parent != base_dir:
+            raise ValueError(f"주가 저장 경로가 저장소 디렉터리를 벗어납니다: {symbol!r}")
+        self.meta_path = self.path / "meta.json"
+
+    def _column_path(self, column: str) -> Path:
+        return self.path / f"{column}.bin"
+
+    def _column_length(self, column: str) -> int:
+        column_path = self._column_path(column)
+        if not column_path.exists():
+            return 0
+        return column_path.stat().st_size // COLUMNS[column].itemsize
+
+    def __len__(self) -> int:
+        # 쓰기 도중 중단되어 컬럼 길이가 다르면 가장 짧은 길이까지만 유효한 것으로 봅니다.
+        return min(self._column_length(column) for column in COLUMNS)
+
+    def load(self) -> Dict[str, np.ndarray]:
+        """모든 컬럼을 읽기 전용 memmap 배열로 반환합니다. 날짜는 항상 오름차순입니다."""
+        length = len(self)
+        if length == 0:
+            return {column: np.empty(0, dtype=dtype) for column, dtype in COLUMNS.items()}
+
+        arrays = {
+            column: np.memmap(self._column_path(column), dtype=dtype, mode="r", shape=(length,))
+            for column, dtype in COLUMNS.items()
+        }
+        # 다른 프로세스와 동시에 append되어 날짜가 중복된 행이 있다면 걸러냅니다.
+        dates = arrays["date"]
+        if length > 1 and not np.all(dates[1:] > dates[:-1]):
+            keep = np.concatenate(([True], dates[1:] > np.maximum.accumulate(dates)[:-1]))
+            arrays = {column: np.asarray(values)[keep] for column, values in arrays.items()}
+        return arrays
+
+    def last_date(self) -> Optional[date]:
+        length = len(self)
+        if length == 0:
+            return None
+        dates = np.memmap(self._column_path("date"), dtype=COLUMNS["date"], mode="r", shape=(length,))
+        return date(1970, 1, 1) + timedelta(days=int(dates[-1]))
+
+    def append(self, columns: Dict[str, np.ndarray]):
+        """새로운 행들을 각 컬럼 파일 끝에 덧붙입니다."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        length = len(self)
+        for column, dtype in COLUMNS.items():
+            with open(self._column_path(column), "ab") as f:
+                # 이전 쓰기가 중간에 끊겼다면 유효 길이 이후의 잘린 데이터를 먼저 정리합니다.
+                f.truncate(length * dtype.itemsize)
+                f.write(np.ascontiguousarray(columns[column], dtype=dtype).tobytes())
+
+    def reset(self):
+        """저장된 모든 데이터를 삭제합니다. (액면분할 등으로 과거 가격이 바뀐 경우)"""
+        for column in COLUMNS:
+            self._column_path(column).unlink(missing_ok=True)
+        self.meta_path.unlink(missing_ok=True)
+
+    def synced_at(self) -> float:
+        try:
+            return json.loads(self.meta_path.read_text(encoding="utf-8")).get("synced_at", 0.0)
+        except (OSError, ValueError):
+            return 0.0
+
+    def mark_synced(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.meta_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"synced_at": time.time()}), encoding="utf-8")
+        os.replace(tmp_path, self.meta_path)
+
+
+def _history_to_columns(history: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """yfinance history DataFrame을 저장소 컬럼 형식으로 변환합니다."""
+    index = pd.DatetimeIndex(history.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    days = index.normalize().values.astype("datetime64[D]").astype(np.int64)
+    return {
+        "date": days,
+        "open": history["Open"].to_numpy(dtype=np.float64),
+        "high": history["High"].to_numpy(dtype=np.float64),
+        "low": history["Low"].to_numpy(dtype=np.float64),
+        "close": history["Close"].to_numpy(dtype=np.float64),
+        "volume": history["Volume"].to_numpy(dtype=np.float64),
+    }
+
+
+def _completed_sessions(history: pd.DataFrame) -> pd.DataFrame:
+    """아직 끝나지 않은 오늘 봉은 저장하지 않도록 거래소 기준 오늘 이전의 행만 남깁니다."""
+    if history.empty:
+        return history
+    today = pd.Timestamp.now(tz=history.index.tz).normalize()
+    return history[history.index < today]
+
+
+def sync_price_history(symbol: str, force: bool = False) -> int:
+    """
+    저장소에 없는 최근 구간만 yfinance에서 가져와 덧붙입니다.
+
+    Args:
+        symbol (str): 주식 심볼 (e.g., "AAPL").
+        force (bool): True이면 마지막 동기화 시각과 관계없이 동기화합니다.
+
+    Returns:
+        int: 새로 저장한 행 수
+    """
+    store = PriceHistoryStore(symbol)
+    with _get_symbol_lock(store.symbol):
+        if not force and time.time() - store.synced_at() < settings.PRICE_SYNC_INTERVAL_SECONDS:
+            logger.debug(f"'{store.symbol}' 주가 데이터가 최근에 동기화되어 건너뜁니다.")
+            return 0
+
+        ticker = yf.Ticker(store.symbol)
+        last = store.last_date()
+
+        if last is None:
+            logger.info(f"'{store.symbol}'의 주가 이력 전체({settings.PRICE_HISTORY_INITIAL_PERIOD})를 가져옵니다.")
+            history = ticker.history(period=settings.PRICE_HISTORY_INITIAL_PERIOD, interval="1d",
+                                     auto_adjust=False, actions=True)
+        else:
+            start = last + timedelta(days=1)
+            if start >= date.today():
+                store.mark_synced()
+                return 0
+            logger.info(f"'{store.symbol}'의 주가 이력을 {start}부터 가져옵니다.")
+            history = ticker.history(start=start.isoformat(), interval="1d", auto_adjust=False, actions=True)
+
+            # 새 구간에 액면분할이 있으면 과거 가격이 모두 조정되므로 전체를 다시 받습니다.
+            if "Stock Splits" in history and (history["Stock Splits"].fillna(0) != 0).any():
+                logger.info(f"'{store.symbol}'의 액면분할을 감지하여 주가 이력을 다시 동기화합니다.")
+                store.reset()
+                history = ticker.history(period=settings.PRICE_HISTORY_INITIAL_PERIOD, interval="1d",
+                                         auto_adjust=False, actions=True)
+                last = None
+
+        history = _completed_sessions(history).dropna(subset=["Open", "High", "Low", "Close"])
+        columns = _history_to_columns(history)
+        if last is not None:
+            last_day = (last - date(1970, 1, 1)).days
+            mask = columns["date"] > last_day
+            columns = {column: values[mask] for column, values in columns.items()}
+
+        appended = len(columns["date"])
+        if appended:
+            store.append(columns)
+        store.mark_synced()
+        logger.info(f"'{store.symbol}' 주가 이력 {appended}행을 저장했습니다. (총 {len(store)}행)")
+        return appended
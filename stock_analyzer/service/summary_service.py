@@ -0,0 +1,203 @@
+import hashlib
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List
+
+from langchain_openai import ChatOpenAI
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+MAP_PROMPT = """
+다음은 뉴스 기사의 일부입니다. 주가 분석에 필요한 사실(수치, 실적, 계약, 일정, 전망 등)을 빠뜨리지 말고 간결하게 요약해주세요.
+
+[기사 내용]
+{text}
+
+[요약 결과]
+"""
+
+REDUCE_PROMPT = """
+다음은 한 뉴스 기사의 각 부분을 요약한 내용입니다. 중복을 없애고 핵심 사실을 하나의 간결한 요약으로 합쳐주세요.
+
+[부분 요약]
+{text}
+
+[요약 결과]
+"""
+
+summary_llm = ChatOpenAI(
+    model="gpt-4.1-mini",
+    temperature=0,
+    api_key=settings.OPENAI_API_KEY,
+    timeout=settings.LLM_TIMEOUT_SECONDS
+)
+
+text_splitter = RecursiveCharacterTextSplitter(
+    chunk_size=settings.SUMMARY_CHUNK_SIZE,
+    chunk_overlap=settings.SUMMARY_CHUNK_OVERLAP,
+)
+
+
+class SummaryCache:
+    """
+    요약 프롬프트의 해시를 키로 요약 결과를 저장하는 로컬 SQLite 캐시.
+    같은 기사(또는 같은 조각)를 다시 요약할 때 LLM을 호출하지 않으며, 여러 워커 프로세스가 같은 파일을 공유합니다.
+    retention_seconds보다 오래된 요약은 생성 시와 이후 PRUNE_INTERVAL_SECONDS마다 삭제합니다.
+    """
+
+    PRUNE_INTERVAL_SECONDS = 3600
+
+    def __init__(self, path: Path, retention_seconds: float):
+        self.path = Path(path)
+        self.retention_seconds = retention_seconds
+        self._pruned_at = 0.0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS summaries (
+                    key TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_summaries_created_at ON summaries (created_at)")
+        self.prune()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        if not keys:
+            return {}
+        placeholders = ", ".join("?" * len(keys))
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT key, summary FROM summaries WHERE key IN ({placeholders})", keys).fetchall()
+        return dict(rows)
+
+    def put_many(self, summaries: Dict[str, str]):
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO summaries (key, summary, created_at) VALUES (?, ?, ?)",
+                [(key, summary, now) for key, summary in summaries.items()]
+            )
+        if now - self._pruned_at >= self.PRUNE_INTERVAL_SECONDS:
+            self.prune()
+
+    def prune(self) -> int:
+        """보존 기간이 지난 요약을 삭제하고 삭제한 건수를 반환합니다."""
+        self._pruned_at = time.time()
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute("DELETE FROM summaries WHERE created_at < ?",
+                                      (self._pruned_at - self.retention_seconds,))
+        except sqlite3.Error as e:
+            logger.warning(f"오래된 요약 캐시 정리 중 오류 발생: {e}")
+            return 0
+        if cursor.rowcount:
+            logger.info(f"오래된 요약 캐시 {cursor.rowcount}건을 삭제했습니다.")
+        return cursor.rowcount
+
+
+summary_cache = SummaryCache(settings.SUMMARY_CACHE_PATH, settings.SUMMARY_CACHE_RETENTION_SECONDS)
+
+
+def _cache_key(prompt: str) -> str:
+    # 모델이나 프롬프트가 바뀌면 다른 키가 되도록 모델 이름과 프롬프트 전체를 해시합니다.
+    return hashlib.sha256(f"{summary_llm.model_name}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+def _summarize_prompts(prompts: List[str]) -> List[str]:
+    """
+    프롬프트 목록을 요약합니다. 캐시에 없는 프롬프트만 최대 SUMMARY_MAX_CONCURRENCY개씩 동시에 LLM에 보냅니다.
+    결과는 입력 순서대로 반환합니다.
+    """
+    if not prompts:
+        return []
+    keys = [_cache_key(prompt) for prompt in prompts]
+    summaries = summary_cache.get_many(keys)
+    # 같은 조각이 여러 번 나와도 한 번만 요약합니다.
+    missing = {key: prompt for key, prompt in zip(keys, prompts) if key not in summaries}
+
+    if missing:
+        responses = summary_llm.batch(
+            list(missing.values()),
+            config={"max_concurrency": settings.SUMMARY_MAX_CONCURRENCY}
+        )
+        fresh = {key: response.content for key, response in zip(missing, responses)}
+        summary_cache.put_many(fresh)
+        summaries.update(fresh)
+
+    logger.info(f"요약 {len(prompts)}건 중 {len(prompts) - len(missing)}건은 캐시를 사용했습니다.")
+    return [summaries[key] for key in keys]
+
+
+def _group_summaries(summaries: List[str], max_chars: int) -> List[List[str]]:
+    """
+    부분 요약들을 합친 길이가 max_chars를 넘지 않도록 앞에서부터 묶습니다.
+    단계마다 요약 수가 줄어들도록 각 묶음에는 최소 두 개를 넣습니다. (마지막 묶음 제외)
+    """
+    groups, current, size = [], [], 0
+    for summary in summaries:
+        if len(current) >= 2 and size + len(summary) > max_chars:
+            groups.append(current)
+            current, size = [], 0
+        current.append(summary)
+        size += len(summary)
+    if current:
+        groups.append(current)
+    return groups
+
+
+def summarize_texts(texts: List[str]) -> List[str]:
+    """
+    여러 기사를 map-reduce 방식으로 요약합니다.
+
+    1. map: 모든 기사를 SUMMARY_CHUNK_SIZE 단위의 조각으로 나누고, 전체 조각을 한 번에 동시 요약합니다.
+    2. reduce: 기사마다 부분 요약이 하나가 될 때까지 부분 요약들을 묶어 다시 요약합니다.
+       단계마다 모든 기사의 묶음을 한 번에 동시 요약하므로, 전체 지연 시간은 기사 길이보다
+       동시 실행 수와 단계 수(log 규모)에 따라 결정됩니다.
+
+    Args:
+        texts (List[str]): 요약할 기사 본문 목록
+
+    Returns:
+        List[str]: 입력 순서대로의 기사별 요약. 빈 본문은 빈 문자열
+    """
+    # map 단계
+    chunks_per_text = [text_splitter.split_text(text) if text and text.strip() else [] for text in texts]
+    map_prompts = [MAP_PROMPT.format(text=chunk) for chunks in chunks_per_text for chunk in chunks]
+    logger.info(f"기사 {len(texts)}건을 {len(map_prompts)}개 조각으로 나누어 요약합니다.")
+    chunk_summaries = iter(_summarize_prompts(map_prompts))
+    partials = [[next(chunk_summaries) for _ in chunks] for chunks in chunks_per_text]
+
+    # reduce 단계
+    level = 0
+    while any(len(summaries) > 1 for summaries in partials):
+        level += 1
+        groups_per_text = [_group_summaries(summaries, settings.SUMMARY_CHUNK_SIZE) for summaries in partials]
+        reduce_prompts = [
+            REDUCE_PROMPT.format(text="\n\n".join(group))
+            for groups in groups_per_text for group in groups if len(group) > 1
+        ]
+        logger.info(f"{level}단계 요약 병합: {len(reduce_prompts)}건")
+        reduced = iter(_summarize_prompts(reduce_prompts))
+        partials = [
+            [next(reduced) if len(group) > 1 else group[0] for group in groups]
+            for groups in groups_per_text
+        ]
+
+    return [summaries[0] if summaries else "" for summaries in partials]
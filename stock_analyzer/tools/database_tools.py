@@ -1,9 +1,12 @@
 import os
 import sys
+import logging
+from typing import Dict, Optional
 from langchain_community.utilities import SQLDatabase
 from langchain_community.agent_toolkits import create_sql_agent
 from langchain_openai import ChatOpenAI
 from langchain.tools import Tool
+from sqlalchemy.exc import ArgumentError
 
 try:
     # This works when the script is imported as part of a package.
@@ -15,12 +18,33 @@ except ImportError:
     sys.path.insert(0, project_root)
     from config import settings
 
+from stock_analyzer.tools.sql_plan_cache import SQLPlanCache, normalize_question
+from stock_analyzer.service.news_dedup_service import excludes_duplicates
+
+logger = logging.getLogger(__name__)
+
+INCLUDE_TABLES = ["stock", "news", "analysis_results"]
+
+
+class DuplicateFilteredSQLDatabase(SQLDatabase):
+    """
+    news 테이블을 읽으면서 중복 기사 제외 조건(duplicate_of IS NULL)이 없는 SQL은 실행하지 않습니다.
+    에이전트는 오류 메시지를 관찰 결과로 받아 조건을 추가한 SQL로 다시 시도합니다.
+    """
+
+    def run(self, command, *args, **kwargs):
+        if isinstance(command, str) and not excludes_duplicates(command):
+            # SQLAlchemyError 하위 예외이므로 sql_db_query 도구가 "Error: ..." 관찰 결과로 돌려줍니다.
+            raise ArgumentError("news 테이블을 조회할 때는 WHERE 절에 duplicate_of IS NULL 조건을 포함해야 합니다.")
+        return super().run(command, *args, **kwargs)
+
+
 # LangChain이 사용할 DB 연결 객체 생성
 # settings.py의 DATABASE_URL을 사용
 # AI가 테이블 정보를 더 잘 이해핟고록 스키마에 포함시킬 테이블을 명시
-db = SQLDatabase.from_uri(
+db = DuplicateFilteredSQLDatabase.from_uri(
     settings.DATABASE_URL,
-    include_tables=["stock", "news", "analysis_results"],
+    include_tables=INCLUDE_TABLES,
     sample_rows_in_table_info=2 # 각 테이블의 샘플 데이터를 2개씩 보여줘서 AI의 이해를 돕습니다.
 )
 
@@ -28,7 +52,8 @@ db = SQLDatabase.from_uri(
 llm = ChatOpenAI(
     model="gpt-4.1-mini",
     temperature=0,
-    api_key=settings.OPENAI_API_KEY
+    api_key=settings.OPENAI_API_KEY,
+    timeout=settings.LLM_TIMEOUT_SECONDS
 )
 
 # SQL Agent 생성
@@ -38,13 +63,83 @@ sql_agent_executor = create_sql_agent(
     db=db,
     agent_type="openai-tools",
     verbose=settings.DEBUG, # Agent의 생각과 행동을 콘솔에 출려가형 디버깅에 용이하게 합니다.
-    handle_parsing_errors=True # SQL 파싱 에러 발생 시 대처 방안을 설정합니다.
+    handle_parsing_errors=True, # SQL 파싱 에러 발생 시 대처 방안을 설정합니다.
+    # 에이전트가 실행한 SQL을 계획 캐시에 저장하기 위해 중간 단계를 함께 반환받습니다.
+    agent_executor_kwargs={"return_intermediate_steps": True}
 )
 
+# 검증된 SQL을 재사용하기 위한 계획 캐시
+sql_plan_cache = SQLPlanCache(
+    engine=db._engine,
+    tables=INCLUDE_TABLES,
+    max_size=settings.SQL_PLAN_CACHE_MAX_SIZE,
+    ttl_seconds=settings.SQL_PLAN_CACHE_TTL_SECONDS,
+    schema_check_interval=settings.SQL_PLAN_CACHE_SCHEMA_CHECK_SECONDS,
+    validator=excludes_duplicates
+)
+
+
+def _extract_last_query(intermediate_steps) -> Optional[str]:
+    """
+    에이전트의 중간 단계에서 오류 없이 실행된 마지막 sql_db_query 호출의 SQL을 찾습니다.
+    """
+    for action, observation in reversed(intermediate_steps or []):
+        if getattr(action, "tool", None) != "sql_db_query":
+            continue
+        if isinstance(observation, str) and observation.startswith("Error"):
+            continue
+        tool_input = action.tool_input
+        if isinstance(tool_input, dict):
+            tool_input = tool_input.get("query")
+        if isinstance(tool_input, str) and tool_input.strip():
+            return tool_input
+    return None
+
+
+def query_database(question: str) -> Dict[str, str]:
+    """
+    자연어 질문으로 DB를 조회합니다.
+    같은 형태의 질문에 대해 검증된 SQL이 캐시에 있으면 LLM 없이 바로 실행하고,
+    없으면 SQL Agent를 실행한 뒤 사용한 SQL을 캐시에 저장합니다.
+
+    Args:
+        question (str): 자연어 질문
+
+    Returns:
+        Dict[str, str]: SQL Agent와 같은 형식의 결과 ('input', 'output' 키 포함)
+            캐시 적중 시 'output'은 조회 결과를 행마다 "column: value" 줄로 나열한 텍스트이고
+            (질문에 '---...---' 구분자가 있으면 행 사이에 사용), 캐시 미스 시에는 SQL Agent가 작성한 문장입니다.
+            호출하는 쪽은 두 형식을 모두 처리해야 합니다. (fetch_db_news_node는 구분자로만 기사를 나눕니다.)
+    """
+    if not settings.SQL_PLAN_CACHE_ENABLED:
+        result = sql_agent_executor.invoke(question)
+        return {"input": question, "output": result["output"]}
+
+    normalized = normalize_question(question)
+    try:
+        plan = sql_plan_cache.lookup(normalized)
+        if plan is not None:
+            logger.info(f"SQL 계획 캐시 적중: {normalized.key}")
+            return {"input": question, "output": sql_plan_cache.execute(plan, normalized)}
+    except Exception as e:
+        logger.warning(f"캐시된 SQL 실행 실패, SQL Agent로 대체합니다: {e}")
+
+    result = sql_agent_executor.invoke(question)
+    sql = _extract_last_query(result.get("intermediate_steps"))
+    if sql:
+        try:
+            sql_plan_cache.store(normalized, sql)
+        except Exception as e:
+            logger.warning(f"SQL 계획 캐시 저장 중 오류 발생: {e}")
+
+    logger.debug(f"SQL 계획 캐시 통계: {sql_plan_cache.stats()}")
+    return {"input": question, "output": result["output"]}
+
+
 # Agent를 LangGraph에서 사용할 수 있는 Tool 객체로 변환
 db_query_tool = Tool(
     name="database_query",
-    func=sql_agent_executor.invoke,
+    func=query_database,
     description="""
     주식, 뉴스, 분석 결과에 대한 정보를 얻기 위해 데이터베이스에 질문할 때 사용합니다.
     질문은 반드시 하나의 완전한 자연어 문장이어야 합니다.
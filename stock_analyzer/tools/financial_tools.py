@@ -1,11 +1,57 @@
+import json
 import logging
+import os
+import time
 import yfinance as yf
 import pandas as pd
-from typing import Dict
+from pathlib import Path
+from typing import Dict, Optional
 from langchain.tools import Tool
+from config import settings
+from stock_analyzer.service.price_history_service import SYMBOL_PATTERN
 
 logger = logging.getLogger(__name__)
 
+# 마지막으로 성공한 재무제표 조회 결과. yfinance 응답이 늦을 때 대체 데이터로 사용합니다.
+# 작업 워커는 별도 프로세스이므로 FINANCIAL_CACHE_DIR의 파일에도 저장하여 프로세스 간에 공유합니다.
+_latest_statements: Dict[str, Dict[str, str]] = {}
+
+
+def _cache_path(symbol: str) -> Optional[Path]:
+    # 파일 경로에 쓰이므로 주가 저장소와 같은 심볼 형식만 허용합니다.
+    if not SYMBOL_PATTERN.match(symbol):
+        return None
+    return Path(settings.FINANCIAL_CACHE_DIR) / f"{symbol}.json"
+
+
+def _save_cached_statements(symbol: str, statements: Dict[str, str]):
+    path = _cache_path(symbol)
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 읽는 쪽이 쓰다 만 파일을 보지 않도록 임시 파일에 쓴 뒤 교체합니다.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"fetched_at": time.time(), "statements": statements},
+                                       ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"'{symbol}'의 재무제표 캐시 저장 중 오류 발생: {e}")
+
+
+def get_cached_financial_statements(symbol: str) -> Dict[str, str]:
+    """마지막으로 성공한 재무제표 조회 결과를 반환합니다. (다른 프로세스의 결과 포함) 없으면 빈 딕셔너리."""
+    if symbol in _latest_statements:
+        return _latest_statements[symbol]
+    path = _cache_path(symbol)
+    if path is None or not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))["statements"]
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"'{symbol}'의 재무제표 캐시를 읽는 중 오류 발생: {e}")
+        return {}
+
 def get_financial_statements(symbol: str) -> Dict[str, str]:
     """주어진 주식 심볼에 대한 재무제표 데이터를 문자열 딕셔너리 형태로 가져옵니다.
     최근 4분기의 재무상태표, 손익계산서, 현금흐름표를 반환합니다.
@@ -36,6 +82,8 @@ def get_financial_statements(symbol: str) -> Dict[str, str]:
             "cash_flow": cash_flow_df.to_string()
         }
 
+        _latest_statements[symbol] = statements_as_strings
+        _save_cached_statements(symbol, statements_as_strings)
         return statements_as_strings
     
     except Exception as e:
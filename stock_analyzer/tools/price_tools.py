@@ -0,0 +1,149 @@
+import logging
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+from langchain.tools import Tool
+
+from stock_analyzer.service.price_history_service import PriceHistoryStore, sync_price_history
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS_PER_YEAR = 252
+RETURN_WINDOWS = {"1주": 5, "1개월": 21, "3개월": 63, "1년": 252}
+MOVING_AVERAGE_WINDOWS = (20, 50, 200)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """누적합을 이용한 이동평균. 결과 길이는 len(values) - window + 1 입니다."""
+    if len(values) < window:
+        return np.empty(0, dtype=np.float64)
+    cumsum = np.cumsum(np.insert(values.astype(np.float64), 0, 0.0))
+    return (cumsum[window:] - cumsum[:-window]) / window
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    단순 이동평균 기반 RSI (Cutler's RSI).
+    Wilder 방식의 재귀 평활 대신 이동평균을 사용하여 전체 구간을 벡터 연산으로 계산합니다.
+    """
+    deltas = np.diff(close)
+    avg_gain = rolling_mean(np.clip(deltas, 0, None), period)
+    avg_loss = rolling_mean(np.clip(-deltas, 0, None), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        values = 100.0 - 100.0 / (1.0 + rs)
+    # 하락이 전혀 없던 구간은 100, 가격 변화가 전혀 없던 구간(거래 정지 등)은 중립인 50으로 처리합니다.
+    return np.select([(avg_gain == 0) & (avg_loss == 0), avg_loss == 0], [50.0, 100.0], values)
+
+
+def compute_price_indicators(prices: Dict[str, np.ndarray]) -> Dict[str, Optional[float]]:
+    """
+    종가/거래량 배열로 수익률, 변동성, 이동평균, RSI 등의 지표를 계산합니다.
+
+    Args:
+        prices (Dict[str, np.ndarray]): PriceHistoryStore.load()의 반환값
+
+    Returns:
+        Dict[str, Optional[float]]: 지표 이름과 최신 값. 데이터가 부족한 지표는 None.
+    """
+    close = np.asarray(prices["close"], dtype=np.float64)
+    volume = np.asarray(prices["volume"], dtype=np.float64)
+    n = len(close)
+    indicators: Dict[str, Optional[float]] = {"last_close": float(close[-1]) if n else None}
+
+    for label, window in RETURN_WINDOWS.items():
+        indicators[f"return_{label}"] = float(close[-1] / close[-1 - window] - 1) if n > window else None
+
+    log_returns = np.diff(np.log(close)) if n > 1 else np.empty(0)
+    for window in (20, 60):
+        if len(log_returns) >= window:
+            indicators[f"volatility_{window}d"] = float(np.std(log_returns[-window:], ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR))
+        else:
+            indicators[f"volatility_{window}d"] = None
+
+    for window in MOVING_AVERAGE_WINDOWS:
+        sma = rolling_mean(close, window)
+        indicators[f"sma_{window}"] = float(sma[-1]) if len(sma) else None
+
+    rsi_values = rsi(close)
+    indicators["rsi_14"] = float(rsi_values[-1]) if len(rsi_values) else None
+
+    window_52w = close[-TRADING_DAYS_PER_YEAR:]
+    indicators["high_52w"] = float(window_52w.max()) if n else None
+    indicators["low_52w"] = float(window_52w.min()) if n else None
+
+    volume_20d = rolling_mean(volume, 20)
+    indicators["avg_volume_20d"] = float(volume_20d[-1]) if len(volume_20d) else None
+    return indicators
+
+
+def _fmt_pct(value: Optional[float]) -> str:
+    return "N/A" if value is None else f"{value * 100:+.2f}%"
+
+
+def _fmt_ratio(value: Optional[float]) -> str:
+    return "N/A" if value is None else f"{value * 100:.2f}%"
+
+
+def _fmt_num(value: Optional[float]) -> str:
+    return "N/A" if value is None else f"{value:,.2f}"
+
+
+def format_price_summary(prices: Dict[str, np.ndarray], indicators: Dict[str, Optional[float]]) -> str:
+    """계산된 지표를 보고서 프롬프트에 넣기 좋은 문자열로 변환합니다."""
+    last_day = date(1970, 1, 1) + timedelta(days=int(prices["date"][-1]))
+    lines = [
+        f"기준일: {last_day} (총 {len(prices['date'])}거래일 데이터)",
+        f"종가: {_fmt_num(indicators['last_close'])}",
+        "기간 수익률: " + ", ".join(f"{label} {_fmt_pct(indicators[f'return_{label}'])}" for label in RETURN_WINDOWS),
+        f"연환산 변동성: 20일 {_fmt_ratio(indicators['volatility_20d'])}, 60일 {_fmt_ratio(indicators['volatility_60d'])}",
+        "이동평균: " + ", ".join(f"{w}일 {_fmt_num(indicators[f'sma_{w}'])}" for w in MOVING_AVERAGE_WINDOWS),
+        f"RSI(14): {_fmt_num(indicators['rsi_14'])}",
+        f"52주 최고/최저: {_fmt_num(indicators['high_52w'])} / {_fmt_num(indicators['low_52w'])}",
+        f"20일 평균 거래량: {_fmt_num(indicators['avg_volume_20d'])}",
+    ]
+    return "\n".join(lines)
+
+
+def get_price_summary(symbol: str, sync: bool = True) -> str:
+    """
+    주어진 심볼의 주가 이력을 동기화하고 기술적 지표 요약을 반환합니다.
+    동기화에 실패하면 저장소에 이미 있는 데이터로 계산합니다.
+
+    Args:
+        symbol (str): 주식 심볼 (e.g., "AAPL").
+        sync (bool): False이면 yfinance를 호출하지 않고 저장된 데이터만 사용합니다.
+
+    Returns:
+        str: 주가 흐름 및 기술적 지표 요약. 데이터가 없으면 빈 문자열.
+    """
+    try:
+        store = PriceHistoryStore(symbol)
+    except ValueError as e:
+        logger.warning(f"주가 이력을 조회하지 않습니다: {e}")
+        return ""
+
+    if sync:
+        try:
+            sync_price_history(store.symbol)
+        except Exception as e:
+            logger.error(f"'{symbol}'의 주가 이력 동기화 중 오류 발생, 저장된 데이터를 사용합니다: {e}", exc_info=True)
+
+    prices = store.load()
+    if len(prices["close"]) == 0:
+        logger.warning(f"'{symbol}'의 저장된 주가 이력이 없습니다.")
+        return ""
+
+    indicators = compute_price_indicators(prices)
+    return format_price_summary(prices, indicators)
+
+
+price_history_tool = Tool(
+    name="price_history_fetcher",
+    func=get_price_summary,
+    description="""
+    특정 주식 심볼(symbol)의 일별 주가 이력을 바탕으로 기간 수익률, 변동성, 이동평균, RSI 등 기술적 지표를 요약합니다.
+    주가 흐름과 최근 가격 움직임을 분석할 때 사용합니다.
+    """
+)
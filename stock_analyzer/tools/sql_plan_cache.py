@@ -0,0 +1,297 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# 질문에서 심볼로 취급할 토큰 (stock.symbol 컬럼이 String(6)이므로 최대 6자)
+SYMBOL_PATTERN = re.compile(r"(?<![A-Za-z])[A-Z]{1,6}(?![A-Za-z])")
+# 한글 조사가 바로 붙는 경우("3개")도 숫자로 인식하도록 ASCII 문자만 경계로 봅니다.
+NUMBER_PATTERN = re.compile(r"(?<![A-Za-z0-9_.])\d+(?![A-Za-z0-9_.])")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+# 질문에 '---ARTICLE SEPARATOR---' 처럼 따옴표로 감싼 구분자가 있으면 결과 행 사이에 사용합니다.
+SEPARATOR_PATTERN = re.compile(r"'(-{2,}[^']+?-{2,})'")
+LIMIT_PATTERN = re.compile(r"\bLIMIT\s+(\d+)\b", re.IGNORECASE)
+# 치환 후 SQL에 남은 문자열 리터럴과 숫자 리터럴 (바인드 파라미터 :n0 등은 제외)
+STRING_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"")
+NUMERIC_LITERAL_PATTERN = re.compile(r"(?<![\w.:])\d+(?![\w.])")
+WRITE_KEYWORDS = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|DROP|ALTER|CREATE|REPLACE|TRUNCATE|GRANT|REVOKE)\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class NormalizedQuestion:
+    """
+    심볼과 숫자를 자리표시자로 치환한 질문.
+
+    Attributes:
+        key: 캐시 키로 사용할 정규화된 질문
+        symbol: 질문에서 추출한 심볼 (없으면 None)
+        numbers: 질문에 등장한 숫자 목록 (n0, n1, ... 순서)
+        separator: 결과 행 사이에 넣을 구분자
+    """
+    key: str
+    symbol: Optional[str]
+    numbers: List[int]
+    separator: str
+
+    def bind_params(self) -> Dict[str, Any]:
+        params: Dict[str, Any] = {f"n{i}": n for i, n in enumerate(self.numbers)}
+        if self.symbol is not None:
+            params["symbol"] = self.symbol
+        return params
+
+
+@dataclass
+class SQLPlan:
+    """검증을 마친 파라미터화된 SQL 문과 메타데이터"""
+    sql: str
+    param_names: Tuple[str, ...]
+    schema_fingerprint: str
+    created_at: float = field(default_factory=time.monotonic)
+    hits: int = 0
+
+
+def normalize_question(question: str) -> NormalizedQuestion:
+    """
+    질문을 캐시 키로 정규화합니다.
+    첫 번째 심볼은 {symbol}, 숫자는 등장 순서대로 {n0}, {n1}... 로 치환합니다.
+    """
+    text_ = WHITESPACE_PATTERN.sub(" ", question).strip()
+
+    separator_match = SEPARATOR_PATTERN.search(text_)
+    separator = separator_match.group(1) if separator_match else ""
+
+    symbol = None
+    symbol_match = SYMBOL_PATTERN.search(text_)
+    if symbol_match:
+        symbol = symbol_match.group(0)
+        text_ = SYMBOL_PATTERN.sub(lambda m: "{symbol}" if m.group(0) == symbol else m.group(0), text_)
+
+    numbers: List[int] = []
+
+    def _replace_number(match: re.Match) -> str:
+        numbers.append(int(match.group(0)))
+        return "{n%d}" % (len(numbers) - 1)
+
+    text_ = NUMBER_PATTERN.sub(_replace_number, text_)
+    return NormalizedQuestion(key=text_.lower(), symbol=symbol, numbers=numbers, separator=separator)
+
+
+def parameterize_sql(sql: str, normalized: NormalizedQuestion) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """
+    에이전트가 생성한 SQL에서 심볼 리터럴과 LIMIT 값을 바인드 파라미터로 치환합니다.
+    질문의 모든 가변 요소(심볼, 숫자)가 SQL에 대응되지 않거나, 치환한 뒤에도 같은 값이
+    다른 위치(LIKE '%AAPL%', OFFSET 3 등)에 남아 있으면 다른 값으로 재사용할 때 틀린 결과가 나오므로 None을 반환합니다.
+    """
+    statement = sql.strip().rstrip(";").strip()
+    if ";" in statement or WRITE_KEYWORDS.search(statement):
+        return None
+    if not re.match(r"^\s*(SELECT|WITH)\b", statement, re.IGNORECASE):
+        return None
+
+    param_names: List[str] = []
+
+    if normalized.symbol is not None:
+        symbol_literal = re.compile(r"(['\"])%s\1" % re.escape(normalized.symbol), re.IGNORECASE)
+        statement, count = symbol_literal.subn(":symbol", statement)
+        if count == 0:
+            return None
+        param_names.append("symbol")
+
+    mapped_numbers = set()
+
+    def _replace_limit(match: re.Match) -> str:
+        value = int(match.group(1))
+        if value in normalized.numbers:
+            index = normalized.numbers.index(value)
+            mapped_numbers.add(index)
+            return f"LIMIT :n{index}"
+        return match.group(0)
+
+    statement = LIMIT_PATTERN.sub(_replace_limit, statement)
+    if len(mapped_numbers) != len(normalized.numbers):
+        return None
+    if _has_leftover_values(statement, normalized):
+        return None
+    param_names.extend(f"n{i}" for i in sorted(mapped_numbers))
+
+    return statement, tuple(param_names)
+
+
+def _has_leftover_values(statement: str, normalized: NormalizedQuestion) -> bool:
+    """치환하지 못한 심볼이나 질문의 숫자가 SQL에 남아 있는지 확인합니다."""
+    if normalized.symbol is not None:
+        symbol = normalized.symbol.lower()
+        # 문자열 리터럴 안에서는 부분 일치도 남은 값으로 봅니다. ('%AAPL%' 등)
+        if any(symbol in literal.lower() for literal in STRING_LITERAL_PATTERN.findall(statement)):
+            return True
+        # 리터럴 밖에서는 식별자(symbol 컬럼, s.symbol 등)와 구분하기 위해 단어 단위로만 찾습니다.
+        outside = STRING_LITERAL_PATTERN.sub("''", statement)
+        if re.search(r"(?<![\w:.])%s(?!\w)" % re.escape(normalized.symbol), outside, re.IGNORECASE):
+            return True
+
+    numbers = set(normalized.numbers)
+    return any(int(literal) in numbers for literal in NUMERIC_LITERAL_PATTERN.findall(statement))
+
+
+def format_rows(columns: Iterable[str], rows: Iterable[Tuple], separator: str = "") -> str:
+    """조회 결과를 에이전트 응답과 비슷한 텍스트로 변환합니다."""
+    columns = list(columns)
+    blocks = []
+    for row in rows:
+        blocks.append("\n".join(f"{column}: {value}" for column, value in zip(columns, row)))
+    joiner = f"\n{separator}\n" if separator else "\n\n"
+    return joiner.join(blocks)
+
+
+class SQLPlanCache:
+    """
+    Text-to-SQL 에이전트가 검증한 SQL을 정규화된 질문 단위로 저장하는 LRU 캐시.
+
+    같은 템플릿의 질문(심볼이나 개수만 다른 질문)이 다시 들어오면 LLM을 거치지 않고
+    캐시된 SQL을 바인드 파라미터와 함께 바로 실행합니다.
+    테이블 스키마가 바뀌면 저장된 계획을 모두 무효화합니다.
+    validator를 주면 이 함수가 False를 반환하는 SQL은 저장하지 않습니다.
+    """
+
+    def __init__(self, engine: Engine, tables: List[str], max_size: int = 256,
+                 ttl_seconds: float = 86400, schema_check_interval: float = 60,
+                 validator: Optional[Callable[[str], bool]] = None):
+        self.engine = engine
+        self.tables = tables
+        self.validator = validator
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.schema_check_interval = schema_check_interval
+
+        self._plans: "OrderedDict[str, SQLPlan]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._schema_fingerprint: Optional[str] = None
+        self._schema_checked_at = 0.0
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "rejected": 0,
+                       "evictions": 0, "expirations": 0, "invalidations": 0, "errors": 0}
+
+    def _compute_schema_fingerprint(self) -> str:
+        inspector = inspect(self.engine)
+        parts = []
+        for table in sorted(self.tables):
+            columns = inspector.get_columns(table)
+            parts.append(table + ":" + ",".join(f"{c['name']} {c['type']}" for c in columns))
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def _current_schema_fingerprint(self) -> str:
+        """스키마 지문을 일정 간격으로만 다시 계산하고, 바뀌었으면 캐시를 비웁니다."""
+        now = time.monotonic()
+        with self._lock:
+            if self._schema_fingerprint is not None and now - self._schema_checked_at < self.schema_check_interval:
+                return self._schema_fingerprint
+
+        fingerprint = self._compute_schema_fingerprint()
+        with self._lock:
+            if self._schema_fingerprint is not None and fingerprint != self._schema_fingerprint:
+                logger.info("DB 스키마 변경을 감지하여 SQL 계획 캐시를 무효화합니다.")
+                self._invalidate_locked()
+            self._schema_fingerprint = fingerprint
+            self._schema_checked_at = now
+        return fingerprint
+
+    def _invalidate_locked(self):
+        self._stats["invalidations"] += len(self._plans)
+        self._plans.clear()
+
+    def invalidate(self):
+        """저장된 모든 계획을 제거하고, 다음 조회 시 스키마 지문을 다시 계산합니다."""
+        with self._lock:
+            self._invalidate_locked()
+            self._schema_fingerprint = None
+
+    def lookup(self, normalized: NormalizedQuestion) -> Optional[SQLPlan]:
+        fingerprint = self._current_schema_fingerprint()
+        with self._lock:
+            plan = self._plans.get(normalized.key)
+            if plan is None:
+                self._stats["misses"] += 1
+                return None
+            if plan.schema_fingerprint != fingerprint or time.monotonic() - plan.created_at > self.ttl_seconds:
+                del self._plans[normalized.key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._plans.move_to_end(normalized.key)
+            plan.hits += 1
+            self._stats["hits"] += 1
+            return plan
+
+    def store(self, normalized: NormalizedQuestion, sql: str) -> Optional[SQLPlan]:
+        """
+        에이전트가 실행한 SQL을 파라미터화하고, 원래 값으로 다시 실행해 검증한 뒤 저장합니다.
+        검증에 실패하면 저장하지 않고 None을 반환합니다.
+        """
+        parameterized = None
+        if self.validator is None or self.validator(sql):
+            parameterized = parameterize_sql(sql, normalized)
+        if parameterized is None:
+            with self._lock:
+                self._stats["rejected"] += 1
+            logger.debug(f"파라미터화할 수 없는 SQL이므로 캐시하지 않습니다: {sql}")
+            return None
+
+        statement, param_names = parameterized
+        try:
+            self._execute(statement, normalized)
+        except Exception as e:
+            with self._lock:
+                self._stats["rejected"] += 1
+            logger.warning(f"파라미터화된 SQL 검증 실패로 캐시하지 않습니다: {e}")
+            return None
+
+        plan = SQLPlan(sql=statement, param_names=param_names,
+                       schema_fingerprint=self._current_schema_fingerprint())
+        with self._lock:
+            self._plans[normalized.key] = plan
+            self._plans.move_to_end(normalized.key)
+            self._stats["stores"] += 1
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+                self._stats["evictions"] += 1
+        logger.info(f"SQL 계획을 캐시에 저장했습니다: {normalized.key}")
+        return plan
+
+    def _execute(self, statement: str, normalized: NormalizedQuestion) -> Tuple[List[str], List[Tuple]]:
+        with self.engine.connect() as conn:
+            result = conn.execute(text(statement), normalized.bind_params())
+            return list(result.keys()), [tuple(row) for row in result.fetchall()]
+
+    def execute(self, plan: SQLPlan, normalized: NormalizedQuestion) -> str:
+        """
+        캐시된 계획을 실행하고 결과를 format_rows 형식의 텍스트로 반환합니다. 실행에 실패하면 해당 계획을 제거합니다.
+        SQL Agent가 작성하는 문장과 형식이 다르며, 질문의 구분자는 행 사이에만 유지됩니다.
+        """
+        try:
+            columns, rows = self._execute(plan.sql, normalized)
+        except Exception:
+            with self._lock:
+                self._plans.pop(normalized.key, None)
+                self._stats["errors"] += 1
+            raise
+        return format_rows(columns, rows, normalized.separator)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중률 등 통계를 반환합니다."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._plans)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
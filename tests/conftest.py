@@ -0,0 +1,14 @@
+import os
+
+# config.settings와 stock_analyzer.database는 import 시점에 환경 변수로 DB 엔진을 만듭니다.
+# 테스트는 실제 DB에 접속하지 않으므로 접속 정보가 없을 때만 임의 값을 채웁니다.
+for name, value in {
+    "DB_TYPE": "mysql",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "3306",
+    "DB_NAME": "test",
+    "OPENAI_API_KEY": "sk-test",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,73 @@
+import threading
+import time
+
+from stock_analyzer.models import PredictionEnum
+from stock_analyzer.service import analysis_service
+from stock_analyzer.service.analysis_service import ArticlePrediction, BatchPrediction
+
+ARTICLES = [
+    {"news_id": news_id, "symbol": "AAPL", "title": f"news {news_id}", "content": "본문"}
+    for news_id in (1, 2, 3)
+]
+
+
+class StubLLM:
+    def __init__(self, results):
+        self.results = results
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return BatchPrediction(results=self.results)
+
+
+def test_classify_batch_keeps_one_result_per_requested_article(monkeypatch):
+    llm = StubLLM([
+        ArticlePrediction(news_id=1, prediction="RISE", reasoning="실적 개선"),
+        ArticlePrediction(news_id=1, prediction="FALL", reasoning="중복 응답"),
+        ArticlePrediction(news_id=99, prediction="FALL", reasoning="입력에 없는 기사"),
+        ArticlePrediction(news_id=3, prediction="NEUTRAL", reasoning="영향 없음"),
+    ])
+    monkeypatch.setattr(analysis_service, "classifier_llm", llm)
+
+    rows = analysis_service.classify_batch(ARTICLES)
+
+    # 입력에 없는 news_id와 두 번째 결과는 버리고, 응답이 없는 2번 기사는 분석하지 않은 상태로 남깁니다.
+    assert [(row["news_id"], row["prediction"], row["reasoning"]) for row in rows] == [
+        (1, PredictionEnum.RISE, "실적 개선"),
+        (3, PredictionEnum.NEUTRAL, "영향 없음"),
+    ]
+    assert len(llm.prompts) == 1
+    assert all(f"news_id: {article['news_id']}" in llm.prompts[0] for article in ARTICLES)
+
+
+def test_concurrent_scoring_of_same_symbol_classifies_each_article_once(monkeypatch):
+    scored_ids = set()
+    classified = []
+
+    def fake_fetch(symbol=None, limit=100, after_id=0):
+        return [article for article in ARTICLES
+                if article["news_id"] > after_id and article["news_id"] not in scored_ids][:limit]
+
+    def fake_classify(batch):
+        time.sleep(0.05)  # 두 번째 호출이 첫 번째 분류 도중에 시작되도록 합니다.
+        classified.extend(article["news_id"] for article in batch)
+        return [{"news_id": article["news_id"]} for article in batch]
+
+    def fake_save(rows):
+        scored_ids.update(row["news_id"] for row in rows)
+
+    monkeypatch.setattr(analysis_service, "fetch_unscored_news", fake_fetch)
+    monkeypatch.setattr(analysis_service, "classify_batch", fake_classify)
+    monkeypatch.setattr(analysis_service, "save_predictions", fake_save)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(analysis_service.score_unscored_news("AAPL")))
+               for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(classified) == [1, 2, 3]
+    assert sorted(results) == [0, 3]
@@ -0,0 +1,34 @@
+from config import settings
+from stock_analyzer.tools import financial_tools
+
+STATEMENTS = {"income_statement": "income", "balance_sheet": "balance", "cash_flow": "cash"}
+
+
+def test_cached_statements_are_shared_through_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "FINANCIAL_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(financial_tools, "_latest_statements", {})
+
+    financial_tools._save_cached_statements("BRK.B", STATEMENTS)
+
+    # 다른 프로세스처럼 메모리 캐시가 비어 있어도 파일에서 읽습니다.
+    assert financial_tools.get_cached_financial_statements("BRK.B") == STATEMENTS
+    assert list(tmp_path.iterdir()) == [tmp_path / "BRK.B.json"]
+
+
+def test_cached_statements_missing_or_invalid(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "FINANCIAL_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(financial_tools, "_latest_statements", {})
+    (tmp_path / "TSLA.json").write_text("{broken", encoding="utf-8")
+
+    assert financial_tools.get_cached_financial_statements("AAPL") == {}
+    assert financial_tools.get_cached_financial_statements("TSLA") == {}
+
+
+def test_cached_statements_reject_path_like_symbols(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "FINANCIAL_CACHE_DIR", tmp_path / "financials")
+    monkeypatch.setattr(financial_tools, "_latest_statements", {})
+
+    financial_tools._save_cached_statements("../AAPL", STATEMENTS)
+
+    assert not (tmp_path / "AAPL.json").exists()
+    assert financial_tools.get_cached_financial_statements("../AAPL") == {}
@@ -0,0 +1,112 @@
+import time
+
+import pytest
+
+from stock_analyzer.jobs.queue import JobStatus, SQLiteJobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SQLiteJobQueue(tmp_path / "jobs.sqlite3", max_attempts=2)
+
+
+def test_enqueue_and_get(queue):
+    job = queue.enqueue("AAPL", callback_url="https://hooks.example.com/done")
+
+    stored = queue.get(job.job_id)
+    assert stored.status == JobStatus.QUEUED
+    assert stored.symbol == "AAPL"
+    assert stored.callback_url == "https://hooks.example.com/done"
+    assert stored.attempts == 0
+    assert queue.get("missing") is None
+
+
+def test_claim_returns_oldest_queued_job(queue):
+    first = queue.enqueue("AAPL")
+    second = queue.enqueue("TSLA")
+
+    claimed = queue.claim("worker-1")
+    assert claimed.job_id == first.job_id
+    assert claimed.status == JobStatus.RUNNING
+    assert claimed.worker_id == "worker-1"
+    assert claimed.attempts == 1
+    assert claimed.started_at is not None
+
+    assert queue.claim("worker-2").job_id == second.job_id
+    assert queue.claim("worker-3") is None
+
+
+def test_complete_marks_job_succeeded(queue):
+    job = queue.enqueue("AAPL")
+    queue.claim("worker-1")
+
+    finished = queue.complete(job.job_id, "worker-1", "report")
+    assert finished.status == JobStatus.SUCCEEDED
+    assert finished.result == "report"
+    assert finished.is_finished
+    assert finished.finished_at is not None
+
+
+def test_fail_requeues_until_max_attempts(queue):
+    job = queue.enqueue("AAPL")
+
+    queue.claim("worker-1")
+    retried = queue.fail(job.job_id, "worker-1", "boom")
+    assert retried.status == JobStatus.QUEUED
+    assert retried.error == "boom"
+    assert retried.finished_at is None
+
+    queue.claim("worker-1")
+    failed = queue.fail(job.job_id, "worker-1", "boom again")
+    assert failed.status == JobStatus.FAILED
+    assert failed.attempts == 2
+    assert failed.finished_at is not None
+    assert queue.claim("worker-1") is None
+
+
+def test_complete_and_fail_ignore_jobs_not_running(queue):
+    job = queue.enqueue("AAPL")
+
+    assert queue.complete(job.job_id, "worker-1", "report") is None
+    assert queue.fail(job.job_id, "worker-1", "boom") is None
+    assert queue.get(job.job_id).status == JobStatus.QUEUED
+
+
+def test_requeue_stale_requeues_or_fails_by_attempts(queue):
+    retry = queue.enqueue("AAPL")
+    exhausted = queue.enqueue("TSLA")
+    queue.claim("worker-1")
+    queue.claim("worker-2")
+    # 두 번째 작업은 이미 재시도 횟수를 모두 사용한 상태로 만듭니다.
+    queue.fail(exhausted.job_id, "worker-2", "boom")
+    queue.claim("worker-2")
+
+    assert queue.requeue_stale(timeout_seconds=3600) == 0
+    time.sleep(0.01)
+    assert queue.requeue_stale(timeout_seconds=0) == 2
+
+    assert queue.get(retry.job_id).status == JobStatus.QUEUED
+    stale = queue.get(exhausted.job_id)
+    assert stale.status == JobStatus.FAILED
+    assert stale.finished_at is not None
+
+
+def test_stale_worker_cannot_overwrite_reassigned_job(queue):
+    job = queue.enqueue("AAPL")
+    queue.claim("worker-1")
+    time.sleep(0.01)
+    queue.requeue_stale(timeout_seconds=0)
+
+    # 시간 초과로 다른 워커에 재할당된 뒤 원래 워커가 늦게 끝난 경우
+    assert queue.claim("worker-2").job_id == job.job_id
+    assert queue.complete(job.job_id, "worker-1", "stale report") is None
+    assert queue.fail(job.job_id, "worker-1", "stale error") is None
+
+    finished = queue.complete(job.job_id, "worker-2", "report")
+    assert finished.status == JobStatus.SUCCEEDED
+    assert finished.result == "report"
+
+    # 성공한 작업을 늦게 끝난 워커가 실패로 되돌리지 못합니다.
+    assert queue.fail(job.job_id, "worker-1", "stale error") is None
+    assert queue.get(job.job_id).status == JobStatus.SUCCEEDED
+    assert queue.get(job.job_id).result == "report"
@@ -0,0 +1,166 @@
+from itertools import combinations
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.mysql import LONGTEXT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from stock_analyzer.models import News, Stock
+from stock_analyzer.service.news_dedup_service import (
+    BAND_BITS,
+    BAND_COUNT,
+    FINGERPRINT_BITS,
+    band_values,
+    excludes_duplicates,
+    find_duplicate,
+    fingerprint_columns,
+    hamming_distance,
+    simhash,
+)
+
+ARTICLE = " ".join(
+    f"Apple reported quarterly revenue growth of {i} percent driven by services and wearables demand"
+    for i in range(6)
+)
+
+
+@compiles(LONGTEXT, "sqlite")
+def _compile_longtext_for_sqlite(type_, compiler, **kw):
+    return "TEXT"
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Stock.__table__.create(engine)
+    News.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([Stock(stock_id=1, symbol="AAPL", exchange="NASDAQ"),
+                     Stock(stock_id=2, symbol="TSLA", exchange="NASDAQ")])
+    session.commit()
+    yield session
+    session.close()
+
+
+def add_news(db, news_id: int, stock_id: int, fingerprint: int, indexed: bool = True):
+    db.add(News(news_id=news_id, title=f"news {news_id}", content="", url=f"/news/{news_id}",
+                stock_id=stock_id, **fingerprint_columns(fingerprint, indexed=indexed)))
+    db.commit()
+
+
+def flip_bits(fingerprint: int, *bits: int) -> int:
+    for bit in bits:
+        fingerprint ^= 1 << bit
+    return fingerprint
+
+
+def test_simhash_is_deterministic_and_fits_fingerprint_bits():
+    fingerprint = simhash(ARTICLE)
+
+    assert fingerprint is not None
+    assert fingerprint == simhash(ARTICLE)
+    assert 0 <= fingerprint < 1 << FINGERPRINT_BITS
+
+
+def test_simhash_ignores_case_and_punctuation():
+    assert simhash(ARTICLE.upper().replace(" ", ", ")) == simhash(ARTICLE)
+
+
+def test_simhash_returns_none_for_short_text():
+    assert simhash("Apple shares rose today") is None
+    assert simhash("") is None
+    assert simhash(None) is None
+
+
+def test_simhash_near_duplicate_is_closer_than_unrelated_text():
+    near_duplicate = ARTICLE.replace("wearables", "accessories", 1)
+    unrelated = " ".join(
+        f"Tesla delivered {i} thousand vehicles as battery costs fell across factories in Shanghai and Berlin"
+        for i in range(6)
+    )
+
+    fingerprint = simhash(ARTICLE)
+    assert hamming_distance(fingerprint, simhash(near_duplicate)) < hamming_distance(fingerprint, simhash(unrelated))
+
+
+def test_band_values_split_fingerprint_into_bands():
+    fingerprint = 0x0123_4567_89AB_CDEF
+
+    assert band_values(fingerprint) == [0xCDEF, 0x89AB, 0x4567, 0x0123]
+    assert sum(value << (band * BAND_BITS) for band, value in enumerate(band_values(fingerprint))) == fingerprint
+
+
+def test_distance_up_to_three_always_shares_a_band():
+    # 비둘기집 원리: 서로 다른 비트 3개 이하는 4개 밴드 중 최대 3개만 바꿀 수 있습니다. (모든 경우를 확인)
+    fingerprint = 0x0123_4567_89AB_CDEF
+    bands = band_values(fingerprint)
+    for distance in range(1, BAND_COUNT):
+        for bits in combinations(range(FINGERPRINT_BITS), distance):
+            other = flip_bits(fingerprint, *bits)
+            assert hamming_distance(fingerprint, other) == distance
+            assert any(a == b for a, b in zip(bands, band_values(other))), bits
+
+
+def test_distance_four_can_miss_every_band():
+    # 밴드마다 한 비트씩 바뀌면 후보 조회에 걸리지 않으므로 최대 거리는 3을 넘을 수 없습니다.
+    fingerprint = 0x0123_4567_89AB_CDEF
+    other = flip_bits(fingerprint, *(band * BAND_BITS for band in range(BAND_COUNT)))
+
+    assert not any(a == b for a, b in zip(band_values(fingerprint), band_values(other)))
+
+
+def test_fingerprint_columns_clear_bands_for_duplicates():
+    fingerprint = 0x0123_4567_89AB_CDEF
+
+    assert fingerprint_columns(fingerprint) == {
+        "content_simhash": "0123456789abcdef",
+        "simhash_band_0": 0xCDEF,
+        "simhash_band_1": 0x89AB,
+        "simhash_band_2": 0x4567,
+        "simhash_band_3": 0x0123,
+    }
+    assert fingerprint_columns(fingerprint, indexed=False) == {
+        "content_simhash": "0123456789abcdef",
+        **{f"simhash_band_{band}": None for band in range(BAND_COUNT)},
+    }
+    assert fingerprint_columns(None)["content_simhash"] is None
+
+
+def test_find_duplicate_returns_closest_match_within_distance(db):
+    fingerprint = 0x0123_4567_89AB_CDEF
+    add_news(db, 1, 1, flip_bits(fingerprint, 0, 20, 40))
+    add_news(db, 2, 1, flip_bits(fingerprint, 5))
+
+    assert find_duplicate(db, 1, fingerprint, max_distance=3) == 2
+
+
+def test_find_duplicate_respects_max_distance(db):
+    fingerprint = 0x0123_4567_89AB_CDEF
+    add_news(db, 1, 1, flip_bits(fingerprint, 0, 20, 40))
+
+    assert find_duplicate(db, 1, fingerprint, max_distance=2) is None
+    assert find_duplicate(db, 1, fingerprint, max_distance=3) == 1
+
+
+def test_find_duplicate_ignores_other_stocks_and_unindexed_duplicates(db):
+    fingerprint = 0x0123_4567_89AB_CDEF
+    add_news(db, 1, 2, fingerprint)
+    add_news(db, 2, 1, fingerprint, indexed=False)
+
+    assert find_duplicate(db, 1, fingerprint, max_distance=3) is None
+
+
+def test_excludes_duplicates_requires_filter_when_reading_news():
+    assert excludes_duplicates("SELECT title FROM news WHERE duplicate_of IS NULL LIMIT 3")
+    assert excludes_duplicates("SELECT n.title FROM `news` n WHERE n.`duplicate_of` is null")
+    assert not excludes_duplicates("SELECT title FROM news ORDER BY news_upload_time DESC LIMIT 3")
+    assert not excludes_duplicates(
+        "SELECT s.symbol, n.title FROM stock s JOIN news n ON n.stock_id = s.stock_id WHERE s.symbol = 'AAPL'"
+    )
+
+
+def test_excludes_duplicates_ignores_other_tables():
+    assert excludes_duplicates("SELECT symbol FROM stock WHERE symbol = 'AAPL'")
+    assert excludes_duplicates("SELECT news_id FROM analysis_results LIMIT 5")
+    assert excludes_duplicates("SELECT COUNT(*) FROM news_archive")
@@ -0,0 +1,113 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from stock_analyzer.service.price_history_service import COLUMNS, PriceHistoryStore
+from stock_analyzer.tools.price_tools import compute_price_indicators, rolling_mean, rsi
+
+
+def make_columns(days, close=None):
+    days = np.asarray(days, dtype=np.int64)
+    close = np.arange(1, len(days) + 1, dtype=np.float64) if close is None else np.asarray(close, dtype=np.float64)
+    return {"date": days, "open": close, "high": close, "low": close, "close": close,
+            "volume": np.full(len(days), 1000.0)}
+
+
+def test_rolling_mean():
+    values = np.array([1, 2, 3, 4, 5])
+
+    np.testing.assert_allclose(rolling_mean(values, 2), [1.5, 2.5, 3.5, 4.5])
+    np.testing.assert_allclose(rolling_mean(values, 5), [3.0])
+    assert len(rolling_mean(values, 6)) == 0
+
+
+def test_rsi_extremes_and_flat_series():
+    np.testing.assert_allclose(rsi(np.arange(20.0)), 100.0)
+    np.testing.assert_allclose(rsi(np.arange(20.0)[::-1]), 0.0)
+    # 가격 변화가 없는 종목(거래 정지 등)을 과매수로 보고하지 않습니다.
+    np.testing.assert_allclose(rsi(np.ones(20)), 50.0)
+    assert len(rsi(np.ones(20))) == 20 - 14
+
+
+def test_rsi_mixed_moves():
+    # 상승 2, 하락 1이 번갈아 나오면 평균 상승/하락 비율로 계산됩니다.
+    close = np.cumsum([100.0] + [2.0, -1.0] * 10)
+    values = rsi(close, period=4)
+
+    np.testing.assert_allclose(values, 100.0 - 100.0 / (1.0 + 2.0))
+
+
+def test_compute_price_indicators():
+    close = np.linspace(100.0, 125.0, 260)
+    indicators = compute_price_indicators(make_columns(np.arange(260), close))
+
+    assert indicators["last_close"] == pytest.approx(125.0)
+    assert indicators["return_1주"] == pytest.approx(close[-1] / close[-6] - 1)
+    assert indicators["return_1년"] == pytest.approx(close[-1] / close[-253] - 1)
+    assert indicators["sma_20"] == pytest.approx(close[-20:].mean())
+    assert indicators["sma_200"] == pytest.approx(close[-200:].mean())
+    assert indicators["rsi_14"] == pytest.approx(100.0)
+    assert indicators["high_52w"] == pytest.approx(125.0)
+    assert indicators["low_52w"] == pytest.approx(close[-252])
+    assert indicators["avg_volume_20d"] == pytest.approx(1000.0)
+    assert indicators["volatility_20d"] == pytest.approx(
+        np.std(np.diff(np.log(close))[-20:], ddof=1) * np.sqrt(252))
+
+
+def test_compute_price_indicators_with_short_history():
+    indicators = compute_price_indicators(make_columns(np.arange(3), [10.0, 11.0, 12.0]))
+
+    assert indicators["last_close"] == 12.0
+    assert indicators["return_1주"] is None
+    assert indicators["volatility_20d"] is None
+    assert indicators["sma_20"] is None
+    assert indicators["rsi_14"] is None
+    assert indicators["high_52w"] == 12.0
+
+
+def test_store_append_and_load(tmp_path):
+    store = PriceHistoryStore("aapl", base_dir=tmp_path)
+    assert store.symbol == "AAPL"
+    assert store.last_date() is None
+    assert all(len(values) == 0 for values in store.load().values())
+
+    store.append(make_columns([19000, 19001]))
+    store.append(make_columns([19002], close=[3.0]))
+
+    prices = store.load()
+    assert len(store) == 3
+    np.testing.assert_array_equal(prices["date"], [19000, 19001, 19002])
+    np.testing.assert_array_equal(prices["close"], [1.0, 2.0, 3.0])
+    assert set(prices) == set(COLUMNS)
+    assert store.last_date() == date(1970, 1, 1) + timedelta(days=19002)
+
+
+def test_store_load_drops_rows_duplicated_by_concurrent_appends(tmp_path):
+    store = PriceHistoryStore("AAPL", base_dir=tmp_path)
+    store.append(make_columns([19000, 19001], close=[1.0, 2.0]))
+    # 두 프로세스가 같은 구간을 동시에 덧붙인 경우
+    store.append(make_columns([19001, 19002], close=[2.5, 3.0]))
+
+    prices = store.load()
+    np.testing.assert_array_equal(prices["date"], [19000, 19001, 19002])
+    np.testing.assert_array_equal(prices["close"], [1.0, 2.0, 3.0])
+
+
+def test_store_append_discards_partially_written_rows(tmp_path):
+    store = PriceHistoryStore("AAPL", base_dir=tmp_path)
+    store.append(make_columns([19000]))
+    # 이전 쓰기가 date 컬럼만 기록하고 중단된 경우
+    with open(store.path / "date.bin", "ab") as f:
+        f.write(np.array([19001], dtype=np.int64).tobytes())
+    assert len(store) == 1
+
+    store.append(make_columns([19002], close=[3.0]))
+
+    np.testing.assert_array_equal(store.load()["date"], [19000, 19002])
+
+
+@pytest.mark.parametrize("symbol", ["../AAPL", "..", "AAPL/..", "", "A" * 11])
+def test_store_rejects_invalid_symbols(tmp_path, symbol):
+    with pytest.raises(ValueError):
+        PriceHistoryStore(symbol, base_dir=tmp_path)
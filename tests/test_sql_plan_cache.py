@@ -0,0 +1,201 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from stock_analyzer.tools.sql_plan_cache import SQLPlanCache, normalize_question, parameterize_sql
+
+NEWS_SQL = (
+    "SELECT n.title, n.content FROM news n JOIN stock s ON n.stock_id = s.stock_id "
+    "WHERE s.symbol = 'AAPL' AND n.duplicate_of IS NULL ORDER BY n.news_upload_time DESC LIMIT 3"
+)
+
+
+def test_normalize_question_replaces_symbol_and_numbers():
+    normalized = normalize_question("AAPL  최신 뉴스 3개와 10일 주가를 '---ARTICLE SEPARATOR---'로 구분해줘")
+
+    assert normalized.symbol == "AAPL"
+    assert normalized.numbers == [3, 10]
+    assert normalized.separator == "---ARTICLE SEPARATOR---"
+    assert normalized.key == "{symbol} 최신 뉴스 {n0}개와 {n1}일 주가를 '---article separator---'로 구분해줘"
+    assert normalized.bind_params() == {"n0": 3, "n1": 10, "symbol": "AAPL"}
+
+
+def test_normalize_question_shares_key_across_symbols_and_numbers():
+    assert normalize_question("AAPL 뉴스 3개").key == normalize_question("TSLA 뉴스 5개").key
+
+
+def test_parameterize_sql_binds_symbol_and_limit():
+    result = parameterize_sql(NEWS_SQL + ";", normalize_question("AAPL 최신 뉴스 3개"))
+
+    assert result is not None
+    statement, param_names = result
+    assert "'AAPL'" not in statement
+    assert "s.symbol = :symbol" in statement
+    assert statement.endswith("LIMIT :n0")
+    assert param_names == ("symbol", "n0")
+
+
+def test_parameterize_sql_rejects_write_statements():
+    normalized = normalize_question("AAPL 뉴스 3개")
+
+    assert parameterize_sql("DELETE FROM news WHERE stock_id = 'AAPL' LIMIT 3", normalized) is None
+    assert parameterize_sql(
+        "WITH t AS (SELECT 1) UPDATE stock SET symbol = 'AAPL' LIMIT 3", normalized
+    ) is None
+
+
+def test_parameterize_sql_rejects_multiple_statements():
+    sql = "SELECT symbol FROM stock WHERE symbol = 'AAPL' LIMIT 3; SELECT 1"
+
+    assert parameterize_sql(sql, normalize_question("AAPL 뉴스 3개")) is None
+
+
+def test_parameterize_sql_rejects_non_select():
+    assert parameterize_sql("SHOW TABLES", normalize_question("테이블 목록")) is None
+
+
+def test_parameterize_sql_rejects_missing_symbol_literal():
+    sql = "SELECT title FROM news WHERE stock_id = 1 AND duplicate_of IS NULL LIMIT 3"
+
+    assert parameterize_sql(sql, normalize_question("AAPL 뉴스 3개")) is None
+
+
+def test_parameterize_sql_rejects_unmapped_numbers():
+    # 질문의 30일이 SQL에 리터럴로 남으므로 다른 값으로 재사용하면 틀린 결과가 나옵니다.
+    sql = (
+        "SELECT title FROM news WHERE duplicate_of IS NULL "
+        "AND news_upload_time >= NOW() - INTERVAL 30 DAY LIMIT 3"
+    )
+
+    assert parameterize_sql(sql, normalize_question("최근 30일 뉴스 3개")) is None
+
+
+def test_parameterize_sql_without_numbers():
+    sql = "SELECT symbol FROM stock WHERE symbol = 'AAPL'"
+
+    assert parameterize_sql(sql, normalize_question("AAPL 종목 정보")) == (
+        "SELECT symbol FROM stock WHERE symbol = :symbol", ("symbol",)
+    )
+
+
+def test_parameterize_sql_rejects_symbol_left_outside_the_bound_literal():
+    sql = "SELECT s.symbol FROM stock s WHERE s.symbol = 'AAPL' OR s.exchange LIKE '%AAPL%' LIMIT 3"
+
+    assert parameterize_sql(sql, normalize_question("AAPL 종목 3개")) is None
+
+
+def test_parameterize_sql_rejects_unquoted_symbol():
+    sql = "SELECT symbol AS AAPL FROM stock WHERE symbol = 'AAPL'"
+
+    assert parameterize_sql(sql, normalize_question("AAPL 종목 정보")) is None
+
+
+def test_parameterize_sql_rejects_question_number_outside_limit():
+    sql = "SELECT symbol FROM stock WHERE symbol = 'AAPL' LIMIT 3 OFFSET 3"
+
+    assert parameterize_sql(sql, normalize_question("AAPL 종목 3개")) is None
+
+
+STOCK_SQL = "SELECT symbol, exchange FROM stock WHERE symbol = '{symbol}'"
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE stock (stock_id INTEGER PRIMARY KEY, symbol TEXT, exchange TEXT)"))
+        conn.execute(text("INSERT INTO stock (symbol, exchange) VALUES ('AAPL', 'NASDAQ'), ('TSLA', 'NASDAQ')"))
+    return engine
+
+
+def make_cache(engine, **kwargs) -> SQLPlanCache:
+    kwargs.setdefault("schema_check_interval", 0)
+    return SQLPlanCache(engine, tables=["stock"], **kwargs)
+
+
+def store_question(cache: SQLPlanCache, question: str, symbol: str):
+    normalized = normalize_question(question)
+    return normalized, cache.store(normalized, STOCK_SQL.format(symbol=symbol))
+
+
+def test_cache_reuses_plan_for_other_symbols(engine):
+    cache = make_cache(engine)
+    _, plan = store_question(cache, "AAPL 거래소", "AAPL")
+    assert plan.sql == "SELECT symbol, exchange FROM stock WHERE symbol = :symbol"
+
+    normalized = normalize_question("TSLA 거래소")
+    hit = cache.lookup(normalized)
+    assert hit is plan
+    assert hit.hits == 1
+    assert cache.execute(hit, normalized) == "symbol: TSLA\nexchange: NASDAQ"
+
+
+def test_cache_does_not_store_rejected_sql(engine):
+    cache = make_cache(engine, validator=lambda sql: "exchange" not in sql)
+    normalized, plan = store_question(cache, "AAPL 거래소", "AAPL")
+
+    assert plan is None
+    assert cache.lookup(normalized) is None
+    assert cache.stats()["rejected"] == 1
+
+
+def test_cache_evicts_least_recently_used_plan(engine):
+    cache = make_cache(engine, max_size=2)
+    first, _ = store_question(cache, "AAPL 거래소", "AAPL")
+    second, _ = store_question(cache, "AAPL 상장 거래소", "AAPL")
+    assert cache.lookup(first) is not None  # first가 가장 최근 사용이 됩니다.
+
+    third, _ = store_question(cache, "AAPL 거래소 정보", "AAPL")
+
+    assert cache.lookup(second) is None
+    assert cache.lookup(first) is not None
+    assert cache.lookup(third) is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
+
+
+def test_cache_expires_plans_after_ttl(engine):
+    cache = make_cache(engine, ttl_seconds=60)
+    normalized, plan = store_question(cache, "AAPL 거래소", "AAPL")
+    plan.created_at -= 61
+
+    assert cache.lookup(normalized) is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_invalidates_plans_after_schema_change(engine):
+    cache = make_cache(engine)
+    normalized, _ = store_question(cache, "AAPL 거래소", "AAPL")
+    assert cache.lookup(normalized) is not None
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE stock ADD COLUMN listed_at TEXT"))
+
+    assert cache.lookup(normalized) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_cache_removes_plan_when_execution_fails(engine):
+    cache = make_cache(engine)
+    normalized, plan = store_question(cache, "AAPL 거래소", "AAPL")
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE stock RENAME COLUMN exchange TO market"))
+
+    with pytest.raises(Exception):
+        cache.execute(plan, normalized)
+    assert cache.stats()["errors"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_reports_hit_rate(engine):
+    cache = make_cache(engine)
+    assert cache.stats()["hit_rate"] == 0.0
+
+    assert cache.lookup(normalize_question("AAPL 거래소")) is None
+    store_question(cache, "AAPL 거래소", "AAPL")
+    for symbol in ("AAPL", "TSLA", "MSFT"):
+        assert cache.lookup(normalize_question(f"{symbol} 거래소")) is not None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+    assert stats["hit_rate"] == 0.75